@@ -2,8 +2,21 @@
 import sys
 import json
 import math
-import numpy as np
-from scipy import stats
+
+# Exact two-sided 95% normal quantile, scipy.stats.norm.ppf(0.975)
+_Z95 = 1.959963984540054
+
+def _update(pm, ps, dm, ds, n):
+    """
+    Scalar core of the Normal-Normal update.
+    Returns (posterior_mean, posterior_std, prior_weight, data_weight).
+    """
+    # Precision = 1 / Variance
+    pp = 1.0 / (ps * ps) if ps > 0 else 1e-6
+    dp = n / (ds * ds) if ds > 0 else 1e-6 # Precision of the sampling distribution of the mean
+    
+    inv_post = 1.0 / (pp + dp) # Posterior variance
+    return (pp * pm + dp * dm) * inv_post, math.sqrt(inv_post), pp * inv_post, dp * inv_post
 
 def bayesian_update(prior_mean, prior_std, data_mean, data_std, n):
     """
@@ -11,27 +24,54 @@ def bayesian_update(prior_mean, prior_std, data_mean, data_std, n):
     Assumes known variance for simplicity (using the sample variance as approximation).
     """
     
-    # Precision = 1 / Variance
-    prior_precision = 1 / (prior_std ** 2) if prior_std > 0 else 1e-6
-    data_precision = n / (data_std ** 2) if data_std > 0 else 1e-6 # Precision of the sampling distribution of the mean
+    posterior_mean, posterior_std, prior_weight, data_weight = _update(
+        prior_mean, prior_std, data_mean, data_std, n
+    )
     
-    posterior_precision = prior_precision + data_precision
-    posterior_variance = 1 / posterior_precision
-    posterior_std = math.sqrt(posterior_variance)
+    # 95% Credible Interval: for a Normal posterior, Mean +/- z(0.975) * Std
+    half_width = _Z95 * posterior_std
     
+    return {
+        "posterior_mean": float(posterior_mean),
+        "posterior_std": float(posterior_std),
+        "credible_interval_95": [float(posterior_mean - half_width), float(posterior_mean + half_width)],
+        "prior_weight": float(prior_weight),
+        "data_weight": float(data_weight)
+    }
+
+def bayesian_update_batch(prior_mean, prior_std, data_mean, data_std, n):
+    """
+    Vectorized Normal-Normal update over arrays of priors and observations.
+    Inputs broadcast against each other; every output field is a list with
+    one entry per sample, in the same layout as bayesian_update.
+    """
+    # Imported here so the scalar CLI path never pays for numpy
+    import numpy as np
+    
+    prior_mean = np.asarray(prior_mean, dtype=np.float64)
+    prior_std = np.asarray(prior_std, dtype=np.float64)
+    data_mean = np.asarray(data_mean, dtype=np.float64)
+    data_std = np.asarray(data_std, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    
+    # Same 1e-6 fallback as the scalar path for non-positive std
+    with np.errstate(divide='ignore'):
+        prior_precision = np.where(prior_std > 0, 1.0 / prior_std ** 2, 1e-6)
+        data_precision = np.where(data_std > 0, n / data_std ** 2, 1e-6)
+    
+    posterior_precision = prior_precision + data_precision
     posterior_mean = (prior_precision * prior_mean + data_precision * data_mean) / posterior_precision
+    posterior_std = np.sqrt(1.0 / posterior_precision)
     
-    # Calculate 95% Credible Interval
-    # For Normal posterior, it's Mean +/- 1.96 * Std
-    lower_ci = posterior_mean - 1.96 * posterior_std
-    upper_ci = posterior_mean + 1.96 * posterior_std
+    lower_ci = posterior_mean - _Z95 * posterior_std
+    upper_ci = posterior_mean + _Z95 * posterior_std
     
     return {
-        "posterior_mean": float(posterior_mean),
-        "posterior_std": float(posterior_std),
-        "credible_interval_95": [float(lower_ci), float(upper_ci)],
-        "prior_weight": float(prior_precision / posterior_precision),
-        "data_weight": float(data_precision / posterior_precision)
+        "posterior_mean": posterior_mean.tolist(),
+        "posterior_std": posterior_std.tolist(),
+        "credible_interval_95": np.stack([lower_ci, upper_ci], axis=-1).tolist(),
+        "prior_weight": (prior_precision / posterior_precision).tolist(),
+        "data_weight": (data_precision / posterior_precision).tolist()
     }
 
 if __name__ == "__main__":
@@ -49,7 +89,11 @@ if __name__ == "__main__":
         new_data_std = data.get('data_std')
         n = data.get('n', 3) # Default to triplicate
         
-        result = bayesian_update(prior_mean, prior_std, new_data_mean, new_data_std, n)
+        # Arrays of samples are handled in a single vectorized pass
+        if any(isinstance(v, list) for v in (prior_mean, prior_std, new_data_mean, new_data_std, n)):
+            result = bayesian_update_batch(prior_mean, prior_std, new_data_mean, new_data_std, n)
+        else:
+            result = bayesian_update(prior_mean, prior_std, new_data_mean, new_data_std, n)
         print(json.dumps(result))
         sys.stdout.flush()
         
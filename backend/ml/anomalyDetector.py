@@ -4,74 +4,164 @@ import joblib
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest, RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GridSearchCV, train_test_split
 from sklearn.metrics import classification_report
 
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:  # ONNX export is skipped; mlService uses sklearn instead
+    convert_sklearn = None
+
+try:
+    import treelite
+    import tl2cgen
+except ImportError:  # native compile is skipped; mlService uses ONNX / sklearn
+    treelite = tl2cgen = None
+
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(BASE_DIR, 'ml_data', 'anomaly_training_data.json')
+PARQUET_PATH = DATA_PATH.replace('.json', '.parquet')
 MODEL_DIR = os.path.join(BASE_DIR, 'ml_models')
 
 # Ensure model directory exists
 if not os.path.exists(MODEL_DIR):
     os.makedirs(MODEL_DIR)
 
+def _remove_stale(path):
+    # A leftover export from an earlier model would be served next to the
+    # freshly trained joblib model
+    if os.path.exists(path):
+        os.remove(path)
+
+def export_onnx(model, path, n_features, options=None):
+    """Export a fitted sklearn model to ONNX for onnxruntime inference; returns success"""
+    if convert_sklearn is None:
+        print(f"⚠ skl2onnx not installed, skipping {path}")
+        _remove_stale(path)
+        return False
+    try:
+        onx = convert_sklearn(
+            model,
+            initial_types=[('X', FloatTensorType([None, n_features]))],
+            options=options,
+            target_opset={'': 15, 'ai.onnx.ml': 3}
+        )
+        with open(path, 'wb') as f:
+            f.write(onx.SerializeToString())
+        return True
+    except Exception as e:
+        print(f"⚠ ONNX export failed, skipping {path}: {e}")
+        _remove_stale(path)
+        return False
+
+def export_native_lib(model, path):
+    """Compile a fitted forest to a native library with Treelite; returns success"""
+    if tl2cgen is None:
+        print(f"⚠ treelite/tl2cgen not installed, skipping {path}")
+        _remove_stale(path)
+        return False
+    try:
+        tl_model = treelite.sklearn.import_model(model)
+        tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=path,
+                           params={'parallel_comp': 4}, verbose=False)
+        return True
+    except Exception as e:
+        print(f"⚠ Native compile failed, skipping {path}: {e}")
+        _remove_stale(path)
+        return False
+
+def convert_training_data():
+    """One-time JSON -> Parquet conversion, redone whenever the JSON is newer"""
+    if os.path.exists(PARQUET_PATH) and (
+            not os.path.exists(DATA_PATH)
+            or os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(DATA_PATH)):
+        return
+    pd.read_json(DATA_PATH).to_parquet(PARQUET_PATH)
+    print(f"✓ Training data converted to {PARQUET_PATH}")
+
 def train_models():
     print("Loading training data...")
+    # Features
+    features = ['mass_balance', 'degradation', 'recovery', 'purity']
     try:
-        with open(DATA_PATH, 'r') as f:
-            data = json.load(f)
-            df = pd.DataFrame(data)
+        convert_training_data()
+        # Columnar read of only the needed columns
+        df = pd.read_parquet(PARQUET_PATH, columns=features + ['is_anomaly'])
     except FileNotFoundError:
         print(f"Error: Training data not found at {DATA_PATH}")
         return
 
-    # Features
-    features = ['mass_balance', 'degradation', 'recovery', 'purity']
-    X = df[features]
-    y = df['is_anomaly']
+    X = df[features].to_numpy(dtype=np.float32)
+    y = df['is_anomaly'].to_numpy()
 
     print(f"Training on {len(df)} samples...")
 
     # 1. Isolation Forest (Unsupervised Anomaly Detection)
     # Contamination is expected proportion of outliers
-    iso_forest = IsolationForest(contamination=0.1, random_state=42)
+    # Single worker: parallel IsolationForest fits copy the data per worker;
+    # the default max_samples='auto' already caps each tree at 256 samples
+    iso_forest = IsolationForest(contamination=0.1, random_state=42, n_jobs=1)
     iso_forest.fit(X)
     
     # Save Isolation Forest
     iso_path = os.path.join(MODEL_DIR, 'isolation_forest.joblib')
     joblib.dump(iso_forest, iso_path)
     print(f"✓ Isolation Forest saved to {iso_path}")
+    
+    # Save feature names for inference, before any of the optional exports
+    features_path = os.path.join(MODEL_DIR, 'model_features.json')
+    with open(features_path, 'w') as f:
+        json.dump(features, f)
+    
+    iso_onnx_path = os.path.join(MODEL_DIR, 'isolation_forest.onnx')
+    if export_onnx(iso_forest, iso_onnx_path, len(features)):
+        print(f"✓ Isolation Forest exported to {iso_onnx_path}")
 
     # 2. Random Forest Classifier (Supervised)
-    # Only if we have labeled data (which we do)
-    if 'is_anomaly' in df.columns:
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        rf_classifier = RandomForestClassifier(n_estimators=100, random_state=42)
-        rf_classifier.fit(X_train, y_train)
-        
-        # Evaluate
-        y_pred = rf_classifier.predict(X_test)
-        print("\nRandom Forest Performance:")
-        print(classification_report(y_test, y_pred))
-        
-        # Save Random Forest
-        rf_path = os.path.join(MODEL_DIR, 'random_forest.joblib')
-        joblib.dump(rf_classifier, rf_path)
-        print(f"✓ Random Forest saved to {rf_path}")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    
+    # Right-size the forest: smallest tree count / depth reaching the best F1.
+    # Ties go to the first candidate, i.e. the shallowest and smallest forest.
+    # Parallelism is across the search's fits (n_jobs=-1), so each forest is
+    # built single-threaded rather than oversubscribing the cores.
+    search = GridSearchCV(
+        RandomForestClassifier(random_state=42, n_jobs=1),
+        {'n_estimators': [20, 50, 100], 'max_depth': [4, 6, 8, None]},
+        scoring='f1', n_jobs=-1, cv=3
+    )
+    search.fit(X_train, y_train)
+    rf_classifier = search.best_estimator_
+    print(f"\nRandom Forest best params: {search.best_params_} (CV F1 {search.best_score_:.3f})")
+    
+    # Evaluate
+    y_pred = rf_classifier.predict(X_test)
+    print("\nRandom Forest Performance:")
+    print(classification_report(y_test, y_pred))
+    
+    # Save Random Forest
+    rf_path = os.path.join(MODEL_DIR, 'random_forest.joblib')
+    joblib.dump(rf_classifier, rf_path)
+    print(f"✓ Random Forest saved to {rf_path}")
+    
+    # zipmap=False keeps probabilities as a plain [N, 2] tensor
+    rf_onnx_path = os.path.join(MODEL_DIR, 'random_forest.onnx')
+    if export_onnx(rf_classifier, rf_onnx_path, len(features),
+                   options={id(rf_classifier): {'zipmap': False}}):
+        print(f"✓ Random Forest exported to {rf_onnx_path}")
+    
+    # Compile the forest to a native library for the inference worker
+    rf_lib_path = os.path.join(MODEL_DIR, 'random_forest.so')
+    if export_native_lib(rf_classifier, rf_lib_path):
+        print(f"✓ Random Forest compiled to {rf_lib_path}")
 
-        # Feature Importance
-        importances = rf_classifier.feature_importances_
-        feature_importance = dict(zip(features, importances))
-        print("\nFeature Importance:")
-        for feature, importance in feature_importance.items():
-            print(f"  {feature}: {importance:.4f}")
-            
-        # Save feature names for inference
-        features_path = os.path.join(MODEL_DIR, 'model_features.json')
-        with open(features_path, 'w') as f:
-            json.dump(features, f)
+    # Feature Importance
+    importances = rf_classifier.feature_importances_
+    feature_importance = dict(zip(features, importances))
+    print("\nFeature Importance:")
+    for feature, importance in feature_importance.items():
+        print(f"  {feature}: {importance:.4f}")
 
 if __name__ == "__main__":
     train_models()
@@ -0,0 +1,84 @@
+"""
+Checks that the ONNX Runtime and Treelite inference paths in mlService agree
+with plain sklearn, in particular on the 30 / 70 risk band edges.
+Run after anomalyDetector.py has trained and exported the models.
+"""
+
+import copy
+import json
+import os
+import sys
+import numpy as np
+import mlService
+from mlService import _FEATURES, _as_percent, load_models, predict
+
+DATA_PATH = os.path.join(mlService.BASE_DIR, 'ml_data', 'anomaly_training_data.json')
+
+def sklearn_only(iso_forest, rf_classifier):
+    """Copies of the models with the compiled kernels detached"""
+    iso, rf = copy.copy(iso_forest), copy.copy(rf_classifier)
+    iso._onnx_session = None
+    rf._onnx_session = None
+    rf._tl_predictor = None
+    return iso, rf
+
+def sample_inputs(n, seed=42):
+    """Training rows jittered by a few percent, plus the rows themselves"""
+    with open(DATA_PATH) as f:
+        rows = [[r[k] for k in _FEATURES] for r in json.load(f)]
+    rng = np.random.default_rng(seed)
+    base = np.asarray(rows, dtype=np.float64)
+    picks = base[rng.integers(len(base), size=n)]
+    jittered = picks * rng.uniform(0.95, 1.05, size=picks.shape)
+    return [dict(zip(_FEATURES, row)) for row in np.vstack([base, jittered]).tolist()]
+
+def main():
+    # float32 tree-vote fractions that must not cross the band edges
+    for p, expected in ((0.3, 30.0), (0.7, 70.0)):
+        assert _as_percent(np.float32(p)) == expected, p
+
+    iso_forest, rf_classifier = load_models()
+    if iso_forest is None:
+        print("✗ Models not found. Run anomalyDetector.py first.")
+        sys.exit(1)
+    
+    backends = []
+    if getattr(rf_classifier, '_tl_predictor', None) is not None:
+        iso, rf = sklearn_only(iso_forest, rf_classifier)
+        rf._tl_predictor = rf_classifier._tl_predictor
+        backends.append(("Treelite", iso, rf))
+    if getattr(rf_classifier, '_onnx_session', None) is not None:
+        iso, rf = sklearn_only(iso_forest, rf_classifier)
+        iso._onnx_session = iso_forest._onnx_session
+        rf._onnx_session = rf_classifier._onnx_session
+        backends.append(("ONNX Runtime", iso, rf))
+    if not backends:
+        print("No compiled models exported; only the sklearn path is in use.")
+        return
+    
+    reference = sklearn_only(iso_forest, rf_classifier)
+    inputs = sample_inputs(300)
+    failed = False
+    for name, iso, rf in backends:
+        mismatches = 0
+        boundary = 0
+        for row in inputs:
+            expected = predict(row, *reference)
+            got = predict(row, iso, rf)
+            if expected['failure_probability'] in (30.0, 70.0):
+                boundary += 1
+            if (got['risk_level'] != expected['risk_level']
+                    or got['is_anomaly'] != expected['is_anomaly']
+                    or abs(got['anomaly_score'] - expected['anomaly_score']) > 1e-6):
+                mismatches += 1
+                print(f"  {row}: sklearn {expected}, {name} {got}")
+        ok = mismatches == 0
+        failed |= not ok
+        print(f"{'✓' if ok else '✗'} {name} vs sklearn: {len(inputs) - mismatches}/{len(inputs)} agree "
+              f"({boundary} on a band edge)")
+    
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
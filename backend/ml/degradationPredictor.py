@@ -5,10 +5,34 @@ Applies chemical transformation rules to predict degradation products
 
 from rdkit import Chem
 from rdkit.Chem import AllChem, Descriptors
+import functools
 import json
 from molecularFeatures import MolecularFeatureExtractor
 
+@functools.lru_cache(maxsize=4096)
+def _mol_and_weight(smiles):
+    """
+    Returns (mol, molecular weight) for a SMILES string, or (None, None) if invalid.
+    Unlike molecularFeatures._parse_smiles, invalid input is returned, not raised.
+    """
+    mol = Chem.MolFromSmiles(smiles)
+    return mol, Descriptors.MolWt(mol) if mol else None
+
+@functools.lru_cache(maxsize=1024)
+def _cached_parent_fp(smiles):
+    """Morgan fingerprint (radius 2) of a parent molecule, keyed by canonical SMILES"""
+    return AllChem.GetMorganFingerprintAsBitVect(_mol_and_weight(smiles)[0], 2)
+
 class DegradationProductPredictor:
+    # Confidence adjustment for stress type specificity
+    _STRESS_MULT = {
+        'acid': 0.9,
+        'base': 0.95,
+        'oxidative': 0.85,
+        'thermal': 0.75,
+        'photolytic': 0.7
+    }
+    
     def __init__(self):
         self.feature_extractor = MolecularFeatureExtractor()
         
@@ -67,6 +91,18 @@ class DegradationProductPredictor:
                 }
             }
         }
+        
+        # Parse each reaction SMARTS once and index the rules by stress type,
+        # so predict_products only walks the rules that can apply
+        self._rules_by_stress = {}
+        for category, rules in self.degradation_rules.items():
+            for rule_name, rule_data in rules.items():
+                rule_data['_rxn'] = AllChem.ReactionFromSmarts(rule_data['smarts'])
+                rule_data['_reactant_patt'] = Chem.MolFromSmarts(rule_data['smarts'].split('>>')[0])
+                for condition in rule_data['conditions']:
+                    self._rules_by_stress.setdefault(condition, []).append(
+                        (category, rule_name, rule_data)
+                    )
     
     def predict_products(self, parent_smiles, stress_type, max_products=5):
         """
@@ -81,64 +117,68 @@ class DegradationProductPredictor:
             List of predicted degradation products with metadata
         """
         
-        parent_mol = Chem.MolFromSmiles(parent_smiles)
+        parent_mol, parent_mw = _mol_and_weight(parent_smiles)
         if parent_mol is None:
             raise ValueError(f"Invalid SMILES: {parent_smiles}")
         
-        parent_mw = Descriptors.MolWt(parent_mol)
+        parent_fp = _cached_parent_fp(Chem.MolToSmiles(parent_mol))
+        multiplier = self._STRESS_MULT.get(stress_type, 0.8)
         
         products = []
-        
-        # Apply relevant transformation rules
-        for category, rules in self.degradation_rules.items():
-            for rule_name, rule_data in rules.items():
-                
-                # Check if rule applies to this stress type
-                if stress_type not in rule_data['conditions']:
-                    continue
-                
-                # Try to apply reaction
-                rxn = AllChem.ReactionFromSmarts(rule_data['smarts'])
-                product_sets = rxn.RunReactants((parent_mol,))
-                
-                for product_set in product_sets:
-                    for product_mol in product_set:
-                        try:
-                            Chem.SanitizeMol(product_mol)
-                            product_smiles = Chem.MolToSmiles(product_mol)
-                            product_mw = Descriptors.MolWt(product_mol)
-                            
-                            # Calculate stoichiometric factor (omega)
-                            omega = parent_mw / product_mw
-                            
-                            products.append({
-                                'smiles': product_smiles,
-                                'molecular_weight': round(product_mw, 2),
-                                'omega': round(omega, 3),
-                                'pathway': rule_data['description'],
-                                'rule_applied': rule_name,
-                                'category': category,
-                                'confidence': self._estimate_confidence(parent_mol, product_mol, stress_type)
-                            })
-                        
-                        except Exception as e:
-                            continue  # Skip invalid products
-        
-        # Remove duplicates
-        unique_products = []
         seen_smiles = set()
         
-        for product in products:
-            if product['smiles'] not in seen_smiles:
-                seen_smiles.add(product['smiles'])
-                unique_products.append(product)
+        # Apply transformation rules relevant to this stress type
+        for category, rule_name, rule_data in self._rules_by_stress.get(stress_type, []):
+            
+            # Skip rules whose reactant pattern cannot match the parent
+            if not parent_mol.HasSubstructMatch(rule_data['_reactant_patt']):
+                continue
+            
+            # Try to apply reaction
+            rxn = rule_data['_rxn']
+            product_sets = rxn.RunReactants((parent_mol,))
+            
+            for product_set in product_sets:
+                for product_mol in product_set:
+                    try:
+                        # Reject duplicates before the expensive sanitize step
+                        candidate_smiles = Chem.MolToSmiles(product_mol)
+                        if candidate_smiles in seen_smiles:
+                            continue
+                        seen_smiles.add(candidate_smiles)
+                        
+                        Chem.SanitizeMol(product_mol)
+                        product_smiles = Chem.MolToSmiles(product_mol)
+                        # Sanitizing can change the SMILES (e.g. aromaticity)
+                        if product_smiles != candidate_smiles:
+                            if product_smiles in seen_smiles:
+                                continue
+                            seen_smiles.add(product_smiles)
+                        # Keyed on canonical SMILES, so repeated products reuse the MW
+                        product_mw = _mol_and_weight(product_smiles)[1]
+                        
+                        # Calculate stoichiometric factor (omega)
+                        omega = parent_mw / product_mw
+                        
+                        products.append({
+                            'smiles': product_smiles,
+                            'molecular_weight': round(product_mw, 2),
+                            'omega': round(omega, 3),
+                            'pathway': rule_data['description'],
+                            'rule_applied': rule_name,
+                            'category': category,
+                            'confidence': self._estimate_confidence(parent_fp, product_mol, multiplier)
+                        })
+                    
+                    except Exception as e:
+                        continue  # Skip invalid products
         
         # Sort by confidence
-        unique_products.sort(key=lambda x: x['confidence'], reverse=True)
+        products.sort(key=lambda x: x['confidence'], reverse=True)
         
-        return unique_products[:max_products]
+        return products[:max_products]
     
-    def _estimate_confidence(self, parent_mol, product_mol, stress_type):
+    def _estimate_confidence(self, parent_fp, product_mol, multiplier):
         """
         Estimate confidence in predicted product
         
@@ -148,24 +188,14 @@ class DegradationProductPredictor:
         - Stress type appropriateness
         """
         
-        # Tanimoto similarity
-        parent_fp = AllChem.GetMorganFingerprintAsBitVect(parent_mol, 2)
+        # Tanimoto similarity (parent_fp is computed once per predict_products call)
         product_fp = AllChem.GetMorganFingerprintAsBitVect(product_mol, 2)
         similarity = AllChem.DataStructs.TanimotoSimilarity(parent_fp, product_fp)
         
         # Base confidence on similarity (similar structure = more likely)
         confidence = similarity * 100
         
-        # Adjust for stress type specificity
-        stress_confidence_multipliers = {
-            'acid': 0.9,
-            'base': 0.95,
-            'oxidative': 0.85,
-            'thermal': 0.75,
-            'photolytic': 0.7
-        }
-        
-        multiplier = stress_confidence_multipliers.get(stress_type, 0.8)
+        # Adjust for stress type specificity (multiplier from _STRESS_MULT)
         confidence *= multiplier
         
         return round(confidence, 1)
@@ -183,9 +213,6 @@ class DegradationProductPredictor:
             Predicted mass balance breakdown
         """
         
-        parent_mol = Chem.MolFromSmiles(parent_smiles)
-        parent_mw = Descriptors.MolWt(parent_mol)
-        
         # Predict products
         products = self.predict_products(parent_smiles, stress_type, max_products=3)
         
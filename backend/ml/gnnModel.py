@@ -1,3 +1,6 @@
+import os
+from typing import Optional
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -9,18 +12,18 @@ class GraphConvolution(nn.Module):
     def __init__(self, in_features, out_features):
         super(GraphConvolution, self).__init__()
         self.projection = nn.Linear(in_features, out_features)
-        self.message_fn = nn.Linear(in_features, out_features)
 
     def forward(self, x, adj):
         """
         x: [N, in_features] - Node features
-        adj: [N, N] - Adjacency matrix (weighted by bond types or normalized)
+        adj: [N, N] - Sparse COO adjacency (bond-type weights, self-loops included)
         """
         # Node projection
         h = self.projection(x)
         
-        # Message passing: A * X
-        m = torch.matmul(adj, h)
+        # Message passing: A * X as one sparse-dense matmul, O(E) work
+        # (torch.mm dispatches to the sparse kernel for a sparse COO adj)
+        m = torch.mm(adj, h)
         
         return F.relu(m)
 
@@ -47,10 +50,14 @@ class MolecularGNN(nn.Module):
         # Global Pooling for whole-molecule score
         self.molecule_score = nn.Linear(hidden_dim, 1)
 
-    def forward(self, x, adj):
+    def forward(self, x, adj, batch: Optional[torch.Tensor] = None, num_molecules: int = 1):
         """
         x: [N, features]
-        adj: [N, N]
+        adj: [N, N] sparse
+        batch: [N] - Molecule id of each atom when several molecules are packed
+               into one block-diagonal graph; None for a single molecule
+        num_molecules: number of molecules in batch, passed in rather than
+               derived from batch.max() so an id with no atoms can't shift it
         """
         # GNN Propagation
         h = self.conv1(x, adj)
@@ -60,17 +67,40 @@ class MolecularGNN(nn.Module):
         atom_scores = self.atom_lability(h) # [N, 1]
         
         # Global molecule susceptibility (max-pooling across atoms)
-        # In a real GNN, we might use global_max_pool
-        molecule_rep = torch.max(h, dim=0)[0]
+        # keepdim: [1, hidden], the same shape as the batched [M, hidden] path
+        if batch is None:
+            molecule_rep = torch.max(h, dim=0, keepdim=True)[0]
+        else:
+            # Per-molecule max pool (global_max_pool): [num_molecules, hidden]
+            index = batch.unsqueeze(-1).expand_as(h)
+            molecule_rep = torch.zeros([num_molecules, h.size(1)], dtype=h.dtype, device=h.device)
+            molecule_rep = molecule_rep.scatter_reduce(0, index, h, reduce='amax', include_self=False)
         molecule_score = torch.sigmoid(self.molecule_score(molecule_rep))
         
         return atom_scores, molecule_score
 
+# gnnPredictor.py runs as a fresh process per request, so the model is
+# scripted once and saved; later processes only pay for torch.jit.load
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'ml_models', 'gnn_placeholder.pt')
+
 def get_placeholder_model():
     """Returns an initialized model with random weights for inference demo"""
+    if os.path.exists(MODEL_PATH):
+        return torch.jit.load(MODEL_PATH)
+    
     model = MolecularGNN()
     model.eval()
-    return model
+    # TorchScript removes per-op Python dispatch from the forward pass
+    scripted = torch.jit.script(model)
+    try:
+        # Write-then-rename so a concurrent request never loads a partial file
+        tmp_path = f"{MODEL_PATH}.{os.getpid()}.tmp"
+        torch.jit.save(scripted, tmp_path)
+        os.replace(tmp_path, MODEL_PATH)
+    except OSError:
+        pass  # read-only deployment: script per process as before
+    return scripted
 
 if __name__ == "__main__":
     # Test pass with dummy data
@@ -80,7 +110,7 @@ if __name__ == "__main__":
     # 5 atoms, 16 features each
     dummy_x = torch.randn(5, 16)
     # Fully connected dummy adjacency for testing
-    dummy_adj = torch.ones(5, 5)
+    dummy_adj = torch.ones(5, 5).to_sparse()
     
     atom_scores, mol_score = model(dummy_x, dummy_adj)
     print(f"Node Scores Shape: {atom_scores.shape}")
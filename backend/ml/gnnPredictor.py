@@ -6,6 +6,13 @@ import json
 import sys
 from gnnModel import get_placeholder_model
 
+# One-hot column offset for the simple hybridizations (SP, SP2, SP3)
+HYBRIDIZATION_INDEX = {
+    Chem.HybridizationType.SP: 0,
+    Chem.HybridizationType.SP2: 1,
+    Chem.HybridizationType.SP3: 2,
+}
+
 class GNNPredictor:
     def __init__(self):
         self.model = get_placeholder_model()
@@ -14,51 +21,59 @@ class GNNPredictor:
         """
         Converts SMILES to a graph representation:
         - Node features: [N, 16] (atomic num, degree, hybrid, aromatic, etc.)
-        - Adjacency matrix: [N, N]
+        - Adjacency matrix: [N, N] sparse COO (bond-type weights + self-loops)
+        Also returns the atom count and the parsed molecule for reuse.
         """
         mol = Chem.MolFromSmiles(smiles)
         if not mol:
             return None
             
         num_atoms = mol.GetNumAtoms()
+        # e.g. "" parses to an empty Mol: no atoms to score or pool
+        if num_atoms == 0:
+            return None
         
         # 1. Feature Extraction (Node features)
-        node_features = []
-        for atom in mol.GetAtoms():
-            features = [
-                atom.GetAtomicNum() / 100.0, # Normalized atomic number
-                atom.GetDegree() / 5.0,
-                atom.GetTotalNumHs() / 4.0,
-                atom.GetImplicitValence() / 5.0,
-                1.0 if atom.GetIsAromatic() else 0.0,
-                1.0 if atom.IsInRing() else 0.0,
-                atom.GetFormalCharge() / 5.0,
-                # Simple hybridizations (SP, SP2, SP3, etc)
-                1.0 if atom.GetHybridization() == Chem.HybridizationType.SP else 0.0,
-                1.0 if atom.GetHybridization() == Chem.HybridizationType.SP2 else 0.0,
-                1.0 if atom.GetHybridization() == Chem.HybridizationType.SP3 else 0.0,
-                # Padding to 16 features
-                0, 0, 0, 0, 0, 0
-            ]
-            node_features.append(features)
+        # Columns: atomic num, degree, Hs, implicit valence, aromatic, ring,
+        # formal charge, SP/SP2/SP3 one-hot; the rest is padding to 16
+        X = np.zeros((num_atoms, 16), dtype=np.float32)
+        for i, atom in enumerate(mol.GetAtoms()):
+            X[i, 0] = atom.GetAtomicNum() / 100.0 # Normalized atomic number
+            X[i, 1] = atom.GetDegree() / 5.0
+            X[i, 2] = atom.GetTotalNumHs() / 4.0
+            X[i, 3] = atom.GetImplicitValence() / 5.0
+            X[i, 4] = 1.0 if atom.GetIsAromatic() else 0.0
+            X[i, 5] = 1.0 if atom.IsInRing() else 0.0
+            X[i, 6] = atom.GetFormalCharge() / 5.0
+            hyb_idx = HYBRIDIZATION_INDEX.get(atom.GetHybridization())
+            if hyb_idx is not None:
+                X[i, 7 + hyb_idx] = 1.0
             
-        x = torch.tensor(node_features, dtype=torch.float)
+        x = torch.from_numpy(X)
         
-        # 2. Adjacency Matrix
-        adj = torch.zeros((num_atoms, num_atoms))
-        for bond in mol.GetBonds():
-            i = bond.GetBeginAtomIdx()
-            j = bond.GetEndAtomIdx()
-            
-            # Weight adjacency by bond type
-            bond_type = bond.GetBondTypeAsDouble()
-            adj[i, j] = bond_type
-            adj[j, i] = bond_type
-            
-        # Add self-loops
-        adj += torch.eye(num_atoms)
+        # 2. Adjacency Matrix, weighted by bond type
+        num_bonds = mol.GetNumBonds()
+        ii = np.empty(num_bonds, dtype=np.int64)
+        jj = np.empty(num_bonds, dtype=np.int64)
+        w = np.empty(num_bonds, dtype=np.float32)
+        for k, bond in enumerate(mol.GetBonds()):
+            ii[k] = bond.GetBeginAtomIdx()
+            jj[k] = bond.GetEndAtomIdx()
+            w[k] = bond.GetBondTypeAsDouble()
+        
+        # Both directions of every bond, plus self-loops with weight 1.0
+        loops = np.arange(num_atoms, dtype=np.int64)
+        src = np.concatenate([ii, jj, loops])
+        dst = np.concatenate([jj, ii, loops])
+        weights = np.concatenate([w, w, np.ones(num_atoms, dtype=np.float32)])
+        
+        # Stored sparse: ~3N non-zeros instead of N^2 entries
+        adj = torch.sparse_coo_tensor(
+            torch.from_numpy(np.stack([src, dst])), torch.from_numpy(weights),
+            (num_atoms, num_atoms)
+        ).coalesce()
         
-        return x, adj, num_atoms
+        return x, adj, num_atoms, mol
 
     def predict(self, smiles):
         """Perform GNN inference on a SMILES string"""
@@ -67,7 +82,7 @@ class GNNPredictor:
             if not graph_data:
                 return {"error": "Invalid SMILES"}
                 
-            x, adj, num_atoms = graph_data
+            x, adj, num_atoms, mol = graph_data
             
             with torch.no_grad():
                 atom_scores, molecule_score = self.model(x, adj)
@@ -75,29 +90,79 @@ class GNNPredictor:
             # Convert to list for JSON serialization
             atom_scores_list = atom_scores.flatten().tolist()
             
-            # Map scores back to atom symbols and indices
-            mol = Chem.MolFromSmiles(smiles)
-            atom_details = []
-            for i, atom in enumerate(mol.GetAtoms()):
-                atom_details.append({
-                    "index": i,
-                    "symbol": atom.GetSymbol(),
-                    "lability": round(atom_scores_list[i], 3)
-                })
-                
-            return {
-                "success": True,
-                "overall_susceptibility": round(molecule_score.item() * 100, 2),
-                "atom_lability": atom_details,
-                "num_atoms": num_atoms,
-                "model_type": "GNN-v1 (Graph Convolutional Network)"
-            }
+            return self._format_result(mol, atom_scores_list, molecule_score.item(), num_atoms)
         except Exception as e:
             return {"error": str(e)}
 
+    def predict_batch(self, smiles_list):
+        """
+        GNN inference on several SMILES in a single forward pass.
+        Molecules are packed into one block-diagonal sparse adjacency and
+        pooled per molecule. Returns one result per SMILES,
+        in input order, in the same format as predict().
+        """
+        results = [{"error": "Invalid SMILES"} for _ in smiles_list]
+        xs, indices, values, batch = [], [], [], []
+        graphs = [] # (input position, mol, num_atoms)
+        offset = 0
+        
+        for pos, smiles in enumerate(smiles_list):
+            graph_data = self.smiles_to_graph(smiles)
+            if not graph_data:
+                continue
+            x, adj, num_atoms, mol = graph_data
+            xs.append(x)
+            indices.append(adj.indices() + offset)
+            values.append(adj.values())
+            batch.append(torch.full((num_atoms,), len(graphs), dtype=torch.long))
+            graphs.append((pos, mol, num_atoms))
+            offset += num_atoms
+        
+        if not graphs:
+            return results
+        
+        adj = torch.sparse_coo_tensor(
+            torch.cat(indices, dim=1), torch.cat(values), (offset, offset)
+        ).coalesce()
+        
+        try:
+            with torch.no_grad():
+                atom_scores, molecule_scores = self.model(torch.cat(xs), adj, torch.cat(batch), len(graphs))
+        except Exception as e:
+            return [{"error": str(e)} for _ in smiles_list]
+        
+        sizes = [num_atoms for _, _, num_atoms in graphs]
+        per_molecule = torch.split(atom_scores.flatten(), sizes)
+        molecule_scores = molecule_scores.flatten().tolist()
+        for k, (pos, mol, num_atoms) in enumerate(graphs):
+            results[pos] = self._format_result(
+                mol, per_molecule[k].tolist(), molecule_scores[k], num_atoms
+            )
+        return results
+
+    def _format_result(self, mol, atom_scores_list, molecule_score, num_atoms):
+        """Map scores back to atom symbols and indices"""
+        symbols = [atom.GetSymbol() for atom in mol.GetAtoms()]
+        atom_details = [
+            {"index": i, "symbol": symbol, "lability": round(lability, 3)}
+            for i, (symbol, lability) in enumerate(zip(symbols, atom_scores_list))
+        ]
+        
+        return {
+            "success": True,
+            "overall_susceptibility": round(molecule_score * 100, 2),
+            "atom_lability": atom_details,
+            "num_atoms": num_atoms,
+            "model_type": "GNN-v1 (Graph Convolutional Network)"
+        }
+
 if __name__ == "__main__":
     # Test block
     predictor = GNNPredictor()
-    test_smiles = sys.argv[1] if len(sys.argv) > 1 else "CC(=O)Oc1ccccc1C(=O)O"
-    result = predictor.predict(test_smiles)
+    if len(sys.argv) > 2:
+        # Several SMILES: one batched forward pass
+        result = predictor.predict_batch(sys.argv[1:])
+    else:
+        test_smiles = sys.argv[1] if len(sys.argv) > 1 else "CC(=O)Oc1ccccc1C(=O)O"
+        result = predictor.predict(test_smiles)
     print(json.dumps(result, indent=2))
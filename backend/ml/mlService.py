@@ -2,10 +2,20 @@
 import sys
 import json
 import os
+import functools
 import joblib
-import pandas as pd
 import numpy as np
 
+try:
+    import onnxruntime
+except ImportError:  # sklearn inference is used instead
+    onnxruntime = None
+
+try:
+    import tl2cgen
+except ImportError:  # falls back to ONNX / sklearn for the random forest
+    tl2cgen = None
+
 # Suppress sklearn warnings
 import warnings
 warnings.filterwarnings("ignore")
@@ -13,34 +23,129 @@ warnings.filterwarnings("ignore")
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_DIR = os.path.join(BASE_DIR, 'ml_models')
 
+# Feature order the models were trained on, and a reusable input row
+_FEATURES = ('mass_balance', 'degradation', 'recovery', 'purity')
+_BUF = np.empty((1, len(_FEATURES)), dtype=np.float32)
+
+def _load_onnx_session(name):
+    """ONNX Runtime session for an exported model, or None if unavailable"""
+    path = os.path.join(MODEL_DIR, name)
+    if onnxruntime is None or not os.path.exists(path):
+        return None
+    try:
+        return onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'])
+    except Exception:
+        return None
+
+def _load_treelite_predictor(name):
+    """Predictor for a Treelite-compiled model library, or None if unavailable"""
+    path = os.path.join(MODEL_DIR, name)
+    if tl2cgen is None or not os.path.exists(path):
+        return None
+    try:
+        return tl2cgen.Predictor(path, nthread=1)
+    except Exception:
+        return None
+
+# Every file load_models reads; their mtimes key the cache so a retrain is
+# picked up without restarting the worker
+_MODEL_FILES = ('isolation_forest.joblib', 'random_forest.joblib',
+                'isolation_forest.onnx', 'random_forest.onnx', 'random_forest.so')
+
+def _model_mtimes():
+    """mtime_ns of each model file, None for files not present"""
+    mtimes = []
+    for name in _MODEL_FILES:
+        try:
+            mtimes.append(os.stat(os.path.join(MODEL_DIR, name)).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+@functools.lru_cache(maxsize=1)
+def _load_models_cached(mtimes):
+    # Raises on failure, so a missing or half-written model is never cached
+    iso_forest = joblib.load(os.path.join(MODEL_DIR, 'isolation_forest.joblib'))
+    rf_classifier = joblib.load(os.path.join(MODEL_DIR, 'random_forest.joblib'))
+    # Pin inference to one thread whatever n_jobs the model was saved with
+    # (models from older training runs carry n_jobs=-1); the worker scores one
+    # row per request, where spinning up a joblib pool costs more than the trees
+    iso_forest.n_jobs = 1
+    rf_classifier.n_jobs = 1
+    # Compiled ONNX tree kernels, when exported by anomalyDetector.py
+    iso_forest._onnx_session = _load_onnx_session('isolation_forest.onnx')
+    rf_classifier._onnx_session = _load_onnx_session('random_forest.onnx')
+    rf_classifier._tl_predictor = _load_treelite_predictor('random_forest.so')
+    # feature_importances_ is recomputed from every tree on each access
+    rf_classifier._cached_importances = np.asarray(rf_classifier.feature_importances_, dtype=np.float32)
+    return iso_forest, rf_classifier
+
 def load_models():
+    """
+    Models from MODEL_DIR, reloaded only when a model file changes on disk.
+    Returns (None, None) when they cannot be loaded; the next call retries.
+    """
     try:
-        iso_forest = joblib.load(os.path.join(MODEL_DIR, 'isolation_forest.joblib'))
-        rf_classifier = joblib.load(os.path.join(MODEL_DIR, 'random_forest.joblib'))
-        return iso_forest, rf_classifier
-    except Exception as e:
+        return _load_models_cached(_model_mtimes())
+    except Exception:
         return None, None
 
-def predict(input_data):
-    iso_forest, rf_classifier = load_models()
+def _as_percent(probability):
+    """
+    Probability as a Python float percentage, rounded to 4 decimals.
+    ONNX Runtime and Treelite return float32, so a forest probability that is exactly 0.3
+    or 0.7 under sklearn can land just above the 30 / 70 risk band edges;
+    rounding gives every inference backend the same risk_level.
+    """
+    return round(float(probability) * 100, 4)
+
+def _score_anomaly(iso_forest, X):
+    """Returns (decision_function score, label) for the single row in X"""
+    session = getattr(iso_forest, '_onnx_session', None)
+    if session is not None:
+        label, scores = session.run(None, {'X': X})
+        score, label = scores[0][0], label[0]
+    else:
+        score, label = iso_forest.decision_function(X)[0], iso_forest.predict(X)[0]
+    # Rounded past the float32 noise so ONNX and sklearn report the same score
+    return round(float(score), 6), int(label)
+
+def _failure_percent(rf_classifier, X):
+    """Returns P(class 1) for the single row in X, as a percentage"""
+    predictor = getattr(rf_classifier, '_tl_predictor', None)
+    if predictor is not None:
+        # Output is (rows, targets, classes); class 1 is the last entry
+        return _as_percent(np.ravel(predictor.predict(tl2cgen.DMatrix(X)))[-1])
+    session = getattr(rf_classifier, '_onnx_session', None)
+    if session is not None:
+        _, probabilities = session.run(None, {'X': X})
+        return _as_percent(probabilities[0][1])
+    return _as_percent(rf_classifier.predict_proba(X)[0][1])
+
+def predict(input_data, iso_forest=None, rf_classifier=None):
+    # Callers without their own models use the cached ones, which also
+    # picks up models trained after the worker started
+    if iso_forest is None:
+        iso_forest, rf_classifier = load_models()
     
     if not iso_forest:
         return {"error": "ML models not found. Please train models first."}
 
-    # Prepare features
-    features = ['mass_balance', 'degradation', 'recovery', 'purity']
-    
     # Check if input has all features
-    for f in features:
+    for f in _FEATURES:
         if f not in input_data:
             return {"error": f"Missing feature: {f}"}
-            
-    X = pd.DataFrame([input_data])[features]
+    
+    # Prepare features
+    X = _BUF
+    for i, f in enumerate(_FEATURES):
+        X[0, i] = input_data[f]
     
     # 1. Anomaly Score (Isolation Forest)
     # decision_function returns negative values for outliers, positive for inliers
     # We want anomaly score: lower is more anomalous
-    anomaly_score = iso_forest.decision_function(X)[0]
+    # is_anomaly: -1 for anomaly, 1 for normal
+    anomaly_score, is_anomaly = _score_anomaly(iso_forest, X)
     
     # Convert to probability-like score (0-100)
     # Roughly scale: -0.5 (bad) to 0.5 (good)
@@ -48,22 +153,20 @@ def predict(input_data):
     # decision_function: positive (normal), negative (anomaly)
     # So invert: lower score -> higher probability of anomaly
     
-    # Normalize roughly based on typical IF output range
-    is_anomaly = iso_forest.predict(X)[0] # -1 for anomaly, 1 for normal
-    
     # 2. Failure Prediction (Random Forest)
     if rf_classifier:
-        rf_prob = rf_classifier.predict_proba(X)[0]
         # Assuming class 1 is "anomaly/failure"
-        failure_prob = rf_prob[1] * 100
+        failure_prob = _failure_percent(rf_classifier, X)
         
         # Feature importance Contribution (local interpretability using simple mult)
-        importances = rf_classifier.feature_importances_
-        feature_impact = {}
-        for idx, feat in enumerate(features):
-            feature_impact[feat] = float(importances[idx] * X.iloc[0, idx])
-            
-        top_factors = sorted(feature_impact.items(), key=lambda x: x[1], reverse=True)[:2]
+        importances = getattr(rf_classifier, '_cached_importances', None)
+        if importances is None:
+            importances = rf_classifier.feature_importances_
+        impacts = importances * X[0]
+        
+        # Top-2 by impact; a stable sort keeps equal impacts in feature order,
+        # as the original sorted(..., reverse=True) did
+        top_factors = [_FEATURES[i] for i in np.argsort(-impacts, kind='stable')[:2]]
     else:
         failure_prob = 0
         top_factors = []
@@ -74,25 +177,30 @@ def predict(input_data):
         "anomaly_score": float(anomaly_score),
         "failure_probability": float(failure_prob),
         "risk_level": "HIGH" if failure_prob > 70 else "MODERATE" if failure_prob > 30 else "LOW",
-        "top_factors": [f[0] for f in top_factors],
+        "top_factors": top_factors,
         "model_version": "v1.0"
     }
     
     return result
 
 if __name__ == "__main__":
-    try:
-        # Read input from stdin
-        input_str = sys.stdin.read()
-        if not input_str:
-            print(json.dumps({"error": "No input provided"}))
-            sys.exit(1)
-            
-        input_data = json.loads(input_str)
-        result = predict(input_data)
-        print(json.dumps(result))
+    # Long-running worker: each stdin line is a JSON request answered by
+    # exactly one JSON line on stdout. Models come from load_models() per
+    # request, which only unpickles again after a retrain.
+    handled = False
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        handled = True
+        try:
+            result = predict(json.loads(line))
+        except Exception as e:
+            result = {"error": str(e)}
+        sys.stdout.write(json.dumps(result) + "\n")
         sys.stdout.flush()
-    except Exception as e:
-        print(json.dumps({"error": str(e)}))
+    
+    if not handled:
+        print(json.dumps({"error": "No input provided"}))
         sys.stdout.flush()
         sys.exit(1)
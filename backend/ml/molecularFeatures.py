@@ -4,21 +4,308 @@ Uses RDKit for molecular descriptors and fingerprints
 """
 
 from rdkit import Chem
-from rdkit.Chem import Descriptors, rdMolDescriptors, AllChem
-from rdkit.Chem import Lipinski, Crippen
+from rdkit import DataStructs
+from rdkit.Chem import rdMolDescriptors, rdFingerprintGenerator
+import functools
+import math
 import numpy as np
 import json
 
+# SMARTS patterns for reactive groups
+_REACTIVE_SMARTS = {
+    'ester': 'C(=O)O',
+    'amide': 'C(=O)N',
+    'lactone': 'C1OC(=O)C1',
+    'lactam': 'C1NC(=O)C1',
+    'secondary_alcohol': '[CH](O)',
+    'primary_amine': '[CH2]N',
+    'secondary_amine': '[CH]N',
+    'thioether': 'CSC',
+    'phenol': 'c[OH]',
+    'aromatic_amine': 'cN',
+    'enone': 'C=CC=O',
+    'aldehyde': '[CH]=O',
+    'ketone': 'CC(=O)C',
+}
+
+# Parsed once at import; the hot path only runs substructure matching
+_REACTIVE_PATTERNS = {name: Chem.MolFromSmarts(smarts) for name, smarts in _REACTIVE_SMARTS.items()}
+assert all(pattern is not None for pattern in _REACTIVE_PATTERNS.values()), "Invalid reactive SMARTS"
+
+# Fixed site order for ReactiveSites.counts
+_SITE_NAMES = tuple(_REACTIVE_PATTERNS)
+_SITE_INDEX = {name: i for i, name in enumerate(_SITE_NAMES)}
+
+# Substructure screening fingerprints of the patterns, in _SITE_NAMES order: a
+# pattern can only match if all of its bits are set in the molecule's
+_PATTERN_FPS = tuple(Chem.PatternFingerprint(pattern) for pattern in _REACTIVE_PATTERNS.values())
+
+# Every scored site adds at least 10 points and the score is clamped at 100,
+# so match counts beyond this never change a susceptibility score
+_MAX_SCORED_MATCHES = 10
+
+# Susceptibility rules per stress type, applied in order:
+#   (source, keys, above, weight, cap, reason)
+# When the summed value of keys in source ('site' counts or 'desc'riptors) is
+# above the threshold, adds weight * min(value, cap) (uncapped if cap is None)
+# and the reason, formatted with the value. cap=1 gives a flat adjustment.
+_SCORE_RULES = {
+    # Acid stress targets: amides, lactams, glycosides, imines
+    'acid': (
+        ('site', ('amide',), 0, 25, 3, "{} amide bond(s) - acid labile"),
+        ('site', ('lactam',), 0, 20, None, "{} lactam(s) - prone to ring opening"),
+        ('site', ('ester',), 0, 15, 2, "{} ester(s) - acid hydrolysis"),
+        # Basicity increases acid stability
+        ('desc', ('num_nitrogens',), 0, -10, 1, "Basic nitrogens - somewhat protective"),
+    ),
+    # Base stress targets: esters, lactones, amides (slower)
+    'base': (
+        ('site', ('ester',), 0, 35, 3, "{} ester(s) - base hydrolysis"),
+        ('site', ('lactone',), 0, 30, None, "{} lactone(s) - base-catalyzed opening"),
+        ('site', ('phenol',), 0, 10, None, "{} phenol(s) - can undergo oxidation"),
+    ),
+    # Oxidative stress targets: alcohols, amines, sulfides, aromatics
+    'oxidative': (
+        ('site', ('thioether',), 0, 40, None, "{} sulfide(s) - easily oxidized"),
+        ('site', ('secondary_alcohol',), 0, 25, 2, "{} alcohol(s) - oxidation to ketone"),
+        ('site', ('primary_amine', 'secondary_amine'), 0, 20, 2, "{} amine(s) - N-oxidation"),
+        ('site', ('aromatic_amine',), 0, 30, None, "{} aromatic amine(s) - highly susceptible"),
+    ),
+    # Thermal stress: decarboxylation, eliminations, rearrangements
+    'thermal': (
+        # Beta-lactams are thermally labile
+        ('site', ('lactam',), 0, 25, None, "Lactam(s) present - thermal ring opening"),
+        # High MW increases thermal stress susceptibility
+        ('desc', ('molecular_weight',), 500, 20, 1, "High molecular weight - increased thermal lability"),
+        # Many rotatable bonds = conformational flexibility = more pathways
+        ('desc', ('num_rotatable_bonds',), 5, 15, 1, "High conformational flexibility"),
+    ),
+    # Photolytic stress: aromatics, conjugated systems, chromophores
+    'photolytic': (
+        ('desc', ('num_aromatic_rings',), 0, 30, 3, "{} aromatic ring(s) - UV absorption"),
+        ('site', ('enone',), 0, 35, None, "{} α,β-unsaturated carbonyl(s) - photoreactive"),
+        ('site', ('aromatic_amine',), 0, 25, None, "Aromatic amine(s) - photosensitive"),
+    ),
+}
+
+# F, Cl, Br, I
+_HALOGENS = frozenset((9, 17, 35, 53))
+
+# Set-bit count of every byte value, for numpy without bitwise_count (< 2.0)
+_POPCOUNT_8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1, dtype=np.uint8)
+
+def _popcount_rows(x):
+    """Number of set bits along the last axis of a uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(x).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_8[np.ascontiguousarray(x).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+# Base rate constants (empirical, h⁻¹ at 25°C)
+_BASE_K = {
+    'acid': 0.01,
+    'base': 0.015,
+    'oxidative': 0.005,
+    'thermal': 0.002,
+    'photolytic': 0.008
+}
+
+# Arrhenius constants: Ea / R for Ea = 50 kJ/mol, and 1 / T at 25°C
+_EA_OVER_R = 50000 / 8.314
+_INV_T_REF = 1 / 298
+
+def _arrhenius_factor(temperature):
+    """Arrhenius-like rate correction relative to 25°C, assuming Ea = 50 kJ/mol"""
+    if temperature == 25:
+        return 1.0
+    return math.exp(_EA_OVER_R * (_INV_T_REF - 1 / (temperature + 273)))
+
+def _kinetics_kernel(scores, mws, k_base, temp_factor):
+    """
+    Rate constants for arrays of susceptibility scores and molecular weights
+    
+    Returns (k, half-life in hours, susceptibility factor, MW factor) arrays
+    """
+    k_factor = 1 + scores / 50
+    # Larger molecules degrade slower
+    mw_factor = np.maximum(0.5, 1 - (mws - 300) / 1000)
+    k = k_base * k_factor * mw_factor * temp_factor
+    return k, 0.693 / k, k_factor, mw_factor
+
+def tanimoto_batch(query_packed, library_packed):
+    """
+    Tanimoto similarity of one packed fingerprint against many
+    
+    Args:
+        query_packed: uint64 array from calculate_fingerprint(..., return_packed=True)
+        library_packed: uint64 array of shape (n_molecules, n_words)
+    
+    Returns:
+        float64 array of n_molecules similarities (0 where both are empty)
+    """
+    library_packed = np.atleast_2d(library_packed)
+    common = _popcount_rows(query_packed & library_packed)
+    union = _popcount_rows(query_packed | library_packed)
+    return np.divide(common, union, out=np.zeros(len(library_packed)), where=union > 0)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_smiles(smiles):
+    """Returns (mol, canonical SMILES) for a SMILES string; raises on invalid input"""
+    mol = Chem.MolFromSmiles(smiles)
+    if mol is None:
+        raise ValueError(f"Invalid SMILES: {smiles}")
+    return mol, Chem.MolToSmiles(mol)
+
+def _compute_descriptors(mol):
+    """Descriptor dict for an RDKit molecule"""
+    # Element counts in a single pass over the atoms
+    n_nitrogen = n_oxygen = n_sulfur = n_halogen = 0
+    for atom in mol.GetAtoms():
+        z = atom.GetAtomicNum()
+        if z == 7:
+            n_nitrogen += 1
+        elif z == 8:
+            n_oxygen += 1
+        elif z == 16:
+            n_sulfur += 1
+        elif z in _HALOGENS:
+            n_halogen += 1
+    
+    n_rings = rdMolDescriptors.CalcNumRings(mol)
+    n_aromatic_rings = rdMolDescriptors.CalcNumAromaticRings(mol)
+    # Direct C++ call; Crippen.MolLogP wraps this and discards MR
+    logp, _ = rdMolDescriptors.CalcCrippenDescriptors(mol)
+    
+    return {
+        # Basic properties
+        'molecular_weight': rdMolDescriptors._CalcMolWt(mol),
+        'logp': logp,
+        'tpsa': rdMolDescriptors.CalcTPSA(mol),
+        
+        # Structural features
+        'num_rotatable_bonds': rdMolDescriptors.CalcNumRotatableBonds(mol),
+        'num_aromatic_rings': n_aromatic_rings,
+        'num_aliphatic_rings': rdMolDescriptors.CalcNumAliphaticRings(mol),
+        'num_saturated_rings': rdMolDescriptors.CalcNumSaturatedRings(mol),
+        
+        # Hydrogen bonding
+        'num_h_donors': rdMolDescriptors.CalcNumHBD(mol),
+        'num_h_acceptors': rdMolDescriptors.CalcNumHBA(mol),
+        
+        # Chemical composition
+        'num_heavy_atoms': mol.GetNumHeavyAtoms(),
+        'num_heteroatoms': rdMolDescriptors.CalcNumHeteroatoms(mol),
+        'num_sp3_carbons': rdMolDescriptors.CalcNumAliphaticCarbocycles(mol),
+        
+        # Reactive functional groups
+        'num_nitrogens': n_nitrogen,
+        'num_oxygens': n_oxygen,
+        'num_sulfurs': n_sulfur,
+        'num_halogens': n_halogen,
+        
+        # Stability indicators
+        'fraction_sp3': rdMolDescriptors.CalcFractionCSP3(mol),
+        'aromatic_proportion': n_aromatic_rings / n_rings if n_rings else 0,
+        
+        # Complexity
+        'num_rings': n_rings,
+        'num_bridgehead_atoms': rdMolDescriptors.CalcNumBridgeheadAtoms(mol),
+        'num_spiro_atoms': rdMolDescriptors.CalcNumSpiroAtoms(mol),
+    }
+
+@functools.lru_cache(maxsize=4096)
+def _cached_descriptors(key):
+    """Descriptor dict for a molecule, keyed by canonical SMILES"""
+    return _compute_descriptors(_parse_smiles(key)[0])
+
+class ReactiveSites:
+    """
+    Reactive-site search result in struct-of-arrays form
+    
+    counts: read-only int16 array, one entry per _SITE_NAMES
+    matches: per-site tuples of atom-index tuples (None for count-only
+             results), only expanded into lists by to_dict()
+    
+    site[name] gives the count, so results plug directly into _score
+    """
+    __slots__ = ('counts', 'matches')
+    
+    def __init__(self, counts, matches=None):
+        counts.flags.writeable = False
+        self.counts = counts
+        self.matches = matches
+    
+    def __getitem__(self, site_name):
+        return int(self.counts[_SITE_INDEX[site_name]])
+    
+    def to_dict(self):
+        """{site_name: {'count', 'atom_indices'}} layout used in JSON responses"""
+        if self.matches is None:
+            return {name: {'count': int(count)} for name, count in zip(_SITE_NAMES, self.counts)}
+        return {
+            name: {
+                'count': int(count),
+                'atom_indices': [list(match) for match in matches]
+            }
+            for name, count, matches in zip(_SITE_NAMES, self.counts, self.matches)
+        }
+
+def _find_sites(mol, max_matches=None):
+    """
+    ReactiveSites for an RDKit molecule; with max_matches, only bounded
+    counts are kept
+    """
+    counts = np.zeros(len(_SITE_NAMES), dtype=np.int16)
+    matches = [()] * len(_SITE_NAMES)
+    mol_fp = Chem.PatternFingerprint(mol)
+    
+    for i, (pattern, pattern_fp) in enumerate(zip(_REACTIVE_PATTERNS.values(), _PATTERN_FPS)):
+        # Screened out: the substructure search could not find anything
+        if not DataStructs.AllProbeBitsMatch(pattern_fp, mol_fp):
+            continue
+        if max_matches is not None:
+            counts[i] = len(mol.GetSubstructMatches(pattern, maxMatches=max_matches))
+        else:
+            matches[i] = mol.GetSubstructMatches(pattern)
+            counts[i] = len(matches[i])
+    
+    if max_matches is not None:
+        return ReactiveSites(counts)
+    return ReactiveSites(counts, tuple(matches))
+
+@functools.lru_cache(maxsize=4096)
+def _cached_site_counts(key):
+    """Bounded reactive-site counts for a molecule, keyed by canonical SMILES"""
+    return _find_sites(_parse_smiles(key)[0], _MAX_SCORED_MATCHES)
+
+@functools.lru_cache(maxsize=4096)
+def _cached_sites(smiles):
+    """
+    Full reactive-site matches for a molecule.
+    Keyed by the input SMILES, not the canonical one, because atom indices
+    follow the atom order of the SMILES the caller passed in.
+    """
+    return _find_sites(_parse_smiles(smiles)[0])
+
+# Below this many SMILES a serial loop beats starting a loky worker pool
+_PARALLEL_MIN_SMILES = 256
+
+def _featurize(smiles):
+    """Worker for featurize_many: takes a SMILES string so no Mol is pickled"""
+    return dict(_cached_descriptors(_parse_smiles(smiles)[1]))
+
 class MolecularFeatureExtractor:
     def __init__(self):
         self.feature_names = []
+        # Morgan generators by (radius, n_bits), built on first use
+        self._morgan_gens = {}
     
     def smiles_to_mol(self, smiles):
-        """Convert SMILES string to RDKit molecule"""
-        mol = Chem.MolFromSmiles(smiles)
-        if mol is None:
-            raise ValueError(f"Invalid SMILES: {smiles}")
-        return mol
+        """Convert SMILES string to RDKit molecule (cached and shared, do not modify)"""
+        return _parse_smiles(smiles)[0]
+    
+    def canonical_smiles(self, smiles):
+        """Canonical SMILES, the cache key for atom-order independent results"""
+        return _parse_smiles(smiles)[1]
     
     def calculate_descriptors(self, smiles):
         """
@@ -31,57 +318,45 @@ class MolecularFeatureExtractor:
         - Reactive sites: Nitrogens, oxygens, halogens
         """
         
-        mol = self.smiles_to_mol(smiles)
-        
-        descriptors = {
-            # Basic properties
-            'molecular_weight': Descriptors.MolWt(mol),
-            'logp': Crippen.MolLogP(mol),
-            'tpsa': Descriptors.TPSA(mol),
-            
-            # Structural features
-            'num_rotatable_bonds': Lipinski.NumRotatableBonds(mol),
-            'num_aromatic_rings': rdMolDescriptors.CalcNumAromaticRings(mol),
-            'num_aliphatic_rings': rdMolDescriptors.CalcNumAliphaticRings(mol),
-            'num_saturated_rings': rdMolDescriptors.CalcNumSaturatedRings(mol),
-            
-            # Hydrogen bonding
-            'num_h_donors': Lipinski.NumHDonors(mol),
-            'num_h_acceptors': Lipinski.NumHAcceptors(mol),
-            
-            # Chemical composition
-            'num_heavy_atoms': Lipinski.HeavyAtomCount(mol),
-            'num_heteroatoms': rdMolDescriptors.CalcNumHeteroatoms(mol),
-            'num_sp3_carbons': rdMolDescriptors.CalcNumAliphaticCarbocycles(mol),
-            
-            # Reactive functional groups
-            'num_nitrogens': sum(1 for atom in mol.GetAtoms() if atom.GetAtomicNum() == 7),
-            'num_oxygens': sum(1 for atom in mol.GetAtoms() if atom.GetAtomicNum() == 8),
-            'num_sulfurs': sum(1 for atom in mol.GetAtoms() if atom.GetAtomicNum() == 16),
-            'num_halogens': sum(1 for atom in mol.GetAtoms() if atom.GetAtomicNum() in [9, 17, 35, 53]),
-            
-            # Stability indicators
-            'fraction_sp3': rdMolDescriptors.CalcFractionCSP3(mol),
-            'aromatic_proportion': rdMolDescriptors.CalcNumAromaticRings(mol) / max(1, rdMolDescriptors.CalcNumRings(mol)) if rdMolDescriptors.CalcNumRings(mol) > 0 else 0,
-            
-            # Complexity
-            'num_rings': rdMolDescriptors.CalcNumRings(mol),
-            'num_bridgehead_atoms': rdMolDescriptors.CalcNumBridgeheadAtoms(mol),
-            'num_spiro_atoms': rdMolDescriptors.CalcNumSpiroAtoms(mol),
-        }
+        # Copy so callers never mutate the cached entry
+        return dict(_cached_descriptors(self.canonical_smiles(smiles)))
+    
+    def featurize_many(self, smiles_list, n_jobs=-1):
+        """
+        Descriptors for many molecules, computed in parallel worker processes
+        once there are enough to pay for starting the pool
         
-        return descriptors
+        Returns one descriptor dict per SMILES, in input order
+        """
+        if len(smiles_list) < _PARALLEL_MIN_SMILES or n_jobs == 1:
+            return [_featurize(s) for s in smiles_list]
+        # Imported here so callers that never batch don't pay for joblib
+        from joblib import Parallel, delayed
+        return Parallel(n_jobs=n_jobs, backend="loky")(delayed(_featurize)(s) for s in smiles_list)
     
-    def calculate_fingerprint(self, smiles, radius=2, n_bits=2048):
+    def calculate_fingerprint(self, smiles, radius=2, n_bits=2048, return_packed=False):
         """
         Calculate Morgan (circular) fingerprint
         Used for similarity searches and ML input
+        
+        With return_packed=True, the bits are packed into uint64 words
+        (8x smaller, zero-padded to a whole word) for tanimoto_batch
         """
         mol = self.smiles_to_mol(smiles)
-        fp = AllChem.GetMorganFingerprintAsBitVect(mol, radius, nBits=n_bits)
-        return np.array(fp)
+        gen = self._morgan_gens.get((radius, n_bits))
+        if gen is None:
+            gen = rdFingerprintGenerator.GetMorganGenerator(radius=radius, fpSize=n_bits)
+            self._morgan_gens[(radius, n_bits)] = gen
+        fp = gen.GetFingerprint(mol)
+        arr = np.zeros(n_bits, dtype=np.uint8)
+        DataStructs.ConvertToNumpyArray(fp, arr)
+        if not return_packed:
+            return arr
+        packed = np.packbits(arr)
+        packed = np.pad(packed, (0, -len(packed) % 8))
+        return packed.view(np.uint64)
     
-    def identify_reactive_sites(self, smiles):
+    def identify_reactive_sites(self, smiles, count_only=False):
         """
         Identify potential reactive sites for degradation
         
@@ -89,37 +364,16 @@ class MolecularFeatureExtractor:
         - Hydrolysis (esters, amides, lactones)
         - Oxidation (alcohols, amines, sulfides)
         - Photolysis (aromatic rings, conjugated systems)
-        """
         
-        mol = self.smiles_to_mol(smiles)
-        
-        # SMARTS patterns for reactive groups
-        reactive_patterns = {
-            'ester': Chem.MolFromSmarts('C(=O)O'),
-            'amide': Chem.MolFromSmarts('C(=O)N'),
-            'lactone': Chem.MolFromSmarts('C1OC(=O)C1'),
-            'lactam': Chem.MolFromSmarts('C1NC(=O)C1'),
-            'secondary_alcohol': Chem.MolFromSmarts('[CH](O)'),
-            'primary_amine': Chem.MolFromSmarts('[CH2]N'),
-            'secondary_amine': Chem.MolFromSmarts('[CH]N'),
-            'thioether': Chem.MolFromSmarts('CSC'),
-            'phenol': Chem.MolFromSmarts('c[OH]'),
-            'aromatic_amine': Chem.MolFromSmarts('cN'),
-            'enone': Chem.MolFromSmarts('C=CC=O'),
-            'aldehyde': Chem.MolFromSmarts('[CH]=O'),
-            'ketone': Chem.MolFromSmarts('CC(=O)C'),
-        }
+        Returns a shared, read-only ReactiveSites; use .to_dict() for JSON.
+        With count_only=True, only counts are kept and each search stops at
+        _MAX_SCORED_MATCHES (enough for scoring)
+        """
         
-        reactive_sites = {}
+        if count_only:
+            return _cached_site_counts(self.canonical_smiles(smiles))
         
-        for site_name, pattern in reactive_patterns.items():
-            matches = mol.GetSubstructMatches(pattern)
-            reactive_sites[site_name] = {
-                'count': len(matches),
-                'atom_indices': [list(match) for match in matches] if matches else []
-            }
-        
-        return reactive_sites
+        return _cached_sites(smiles)
     
     def predict_degradation_susceptibility(self, smiles, stress_type):
         """
@@ -136,120 +390,49 @@ class MolecularFeatureExtractor:
         descriptors = self.calculate_descriptors(smiles)
         reactive_sites = self.identify_reactive_sites(smiles)
         
-        # Rule-based scoring by stress type
-        
-        if stress_type == 'acid':
-            # Acid stress targets: amides, lactams, glycosides, imines
-            score = 0
-            reasons = []
-            
-            if reactive_sites['amide']['count'] > 0:
-                score += 25 * min(reactive_sites['amide']['count'], 3)
-                reasons.append(f"{reactive_sites['amide']['count']} amide bond(s) - acid labile")
-            
-            if reactive_sites['lactam']['count'] > 0:
-                score += 20 * reactive_sites['lactam']['count']
-                reasons.append(f"{reactive_sites['lactam']['count']} lactam(s) - prone to ring opening")
-            
-            if reactive_sites['ester']['count'] > 0:
-                score += 15 * min(reactive_sites['ester']['count'], 2)
-                reasons.append(f"{reactive_sites['ester']['count']} ester(s) - acid hydrolysis")
-            
-            # Basicity increases acid stability
-            if descriptors['num_nitrogens'] > 0:
-                score -= 10
-                reasons.append("Basic nitrogens - somewhat protective")
-        
-        elif stress_type == 'base':
-            # Base stress targets: esters, lactones, amides (slower)
-            score = 0
-            reasons = []
-            
-            if reactive_sites['ester']['count'] > 0:
-                score += 35 * min(reactive_sites['ester']['count'], 3)
-                reasons.append(f"{reactive_sites['ester']['count']} ester(s) - base hydrolysis")
-            
-            if reactive_sites['lactone']['count'] > 0:
-                score += 30 * reactive_sites['lactone']['count']
-                reasons.append(f"{reactive_sites['lactone']['count']} lactone(s) - base-catalyzed opening")
-            
-            if reactive_sites['phenol']['count'] > 0:
-                score += 10 * reactive_sites['phenol']['count']
-                reasons.append(f"{reactive_sites['phenol']['count']} phenol(s) - can undergo oxidation")
-        
-        elif stress_type == 'oxidative':
-            # Oxidative stress targets: alcohols, amines, sulfides, aromatics
-            score = 0
-            reasons = []
-            
-            if reactive_sites['thioether']['count'] > 0:
-                score += 40 * reactive_sites['thioether']['count']
-                reasons.append(f"{reactive_sites['thioether']['count']} sulfide(s) - easily oxidized")
-            
-            if reactive_sites['secondary_alcohol']['count'] > 0:
-                score += 25 * min(reactive_sites['secondary_alcohol']['count'], 2)
-                reasons.append(f"{reactive_sites['secondary_alcohol']['count']} alcohol(s) - oxidation to ketone")
-            
-            if reactive_sites['primary_amine']['count'] > 0 or reactive_sites['secondary_amine']['count'] > 0:
-                amine_count = reactive_sites['primary_amine']['count'] + reactive_sites['secondary_amine']['count']
-                score += 20 * min(amine_count, 2)
-                reasons.append(f"{amine_count} amine(s) - N-oxidation")
-            
-            if reactive_sites['aromatic_amine']['count'] > 0:
-                score += 30 * reactive_sites['aromatic_amine']['count']
-                reasons.append(f"{reactive_sites['aromatic_amine']['count']} aromatic amine(s) - highly susceptible")
-        
-        elif stress_type == 'thermal':
-            # Thermal stress: decarboxylation, eliminations, rearrangements
-            score = 0
-            reasons = []
-            
-            # Beta-lactams are thermally labile
-            if reactive_sites['lactam']['count'] > 0:
-                score += 25 * reactive_sites['lactam']['count']
-                reasons.append(f"Lactam(s) present - thermal ring opening")
-            
-            # High MW increases thermal stress susceptibility
-            if descriptors['molecular_weight'] > 500:
-                score += 20
-                reasons.append("High molecular weight - increased thermal lability")
-            
-            # Many rotatable bonds = conformational flexibility = more pathways
-            if descriptors['num_rotatable_bonds'] > 5:
-                score += 15
-                reasons.append("High conformational flexibility")
-        
-        elif stress_type == 'photolytic':
-            # Photolytic stress: aromatics, conjugated systems, chromophores
-            score = 0
-            reasons = []
-            
-            if descriptors['num_aromatic_rings'] > 0:
-                score += 30 * min(descriptors['num_aromatic_rings'], 3)
-                reasons.append(f"{descriptors['num_aromatic_rings']} aromatic ring(s) - UV absorption")
-            
-            if reactive_sites['enone']['count'] > 0:
-                score += 35 * reactive_sites['enone']['count']
-                reasons.append(f"{reactive_sites['enone']['count']} α,β-unsaturated carbonyl(s) - photoreactive")
-            
-            if reactive_sites['aromatic_amine']['count'] > 0:
-                score += 25 * reactive_sites['aromatic_amine']['count']
-                reasons.append(f"Aromatic amine(s) - photosensitive")
-        
-        else:
-            score = 50
-            reasons = ["Unknown stress type - default moderate susceptibility"]
-        
-        # Cap score at 100
-        score = min(score, 100)
+        return self.score_susceptibility(descriptors, reactive_sites, stress_type)
+    
+    def score_susceptibility(self, descriptors, reactive_sites, stress_type):
+        """
+        predict_degradation_susceptibility from precomputed descriptors and
+        reactive sites, for callers that already hold them
+        """
+        score, reasons = self._score(descriptors, reactive_sites, stress_type)
         
         return {
             'susceptibility_score': score,
             'level': 'HIGH' if score > 70 else 'MODERATE' if score > 40 else 'LOW',
             'reasons': reasons,
-            'reactive_sites': reactive_sites
+            'reactive_sites': reactive_sites.to_dict()
         }
     
+    def _score(self, descriptors, site_counts, stress_type):
+        """
+        Rule-based susceptibility score (0-100) and reasons
+        
+        site_counts: ReactiveSites (or any {site_name: count} mapping)
+        """
+        
+        rules = _SCORE_RULES.get(stress_type)
+        if rules is None:
+            return 50, ["Unknown stress type - default moderate susceptibility"]
+        
+        score = 0
+        reasons = []
+        sources = {'site': site_counts, 'desc': descriptors}
+        
+        for source, keys, above, weight, cap, reason in rules:
+            values = sources[source]
+            value = sum(values[key] for key in keys)
+            if value > above:
+                score += weight * (value if cap is None else min(value, cap))
+                reasons.append(reason.format(value))
+        
+        # Cap score at 100
+        score = min(score, 100)
+        
+        return score, reasons
+    
     def estimate_degradation_rate(self, smiles, stress_type, temperature=25):
         """
         Estimate degradation rate constant (k) using QSAR-like approach
@@ -257,32 +440,28 @@ class MolecularFeatureExtractor:
         Returns estimated k (h⁻¹) and half-life
         """
         
-        susceptibility = self.predict_degradation_susceptibility(smiles, stress_type)
+        # Only the score is needed here, so use the count-only site search
         descriptors = self.calculate_descriptors(smiles)
+        site_counts = self.identify_reactive_sites(smiles, count_only=True)
+        score, _ = self._score(descriptors, site_counts, stress_type)
         
-        # Base rate constants (empirical, h⁻¹ at 25°C)
-        base_k = {
-            'acid': 0.01,
-            'base': 0.015,
-            'oxidative': 0.005,
-            'thermal': 0.002,
-            'photolytic': 0.008
-        }
-        
-        k_base = base_k.get(stress_type, 0.005)
+        return self.rate_from_score(descriptors, score, stress_type, temperature)
+    
+    def rate_from_score(self, descriptors, score, stress_type, temperature=25):
+        """
+        estimate_degradation_rate from precomputed descriptors and
+        susceptibility score
+        """
+        k_base = _BASE_K.get(stress_type, 0.005)
         
         # Adjust based on susceptibility score
-        k_factor = 1 + (susceptibility['susceptibility_score'] / 50)
+        k_factor = 1 + (score / 50)
         
         # Adjust for molecular weight (larger molecules degrade slower)
         mw_factor = max(0.5, 1 - (descriptors['molecular_weight'] - 300) / 1000)
         
         # Temperature correction (Arrhenius-like)
-        if temperature != 25:
-            # Assume Ea = 50 kJ/mol
-            temp_factor = np.exp((50000 / 8.314) * ((1/298) - (1/(temperature + 273))))
-        else:
-            temp_factor = 1.0
+        temp_factor = _arrhenius_factor(temperature)
         
         k_estimated = k_base * k_factor * mw_factor * temp_factor
         
@@ -300,6 +479,38 @@ class MolecularFeatureExtractor:
                 'temperature_factor': temp_factor
             }
         }
+    
+    def estimate_degradation_rates(self, smiles_list, stress_type, temperature=25):
+        """
+        Batch version of estimate_degradation_rate for one stress type and
+        temperature; the per-molecule arithmetic runs as one NumPy pass
+        """
+        scores = np.empty(len(smiles_list))
+        mws = np.empty(len(smiles_list))
+        for i, smiles in enumerate(smiles_list):
+            descriptors = self.calculate_descriptors(smiles)
+            site_counts = self.identify_reactive_sites(smiles, count_only=True)
+            scores[i] = self._score(descriptors, site_counts, stress_type)[0]
+            mws[i] = descriptors['molecular_weight']
+        
+        k_base = _BASE_K.get(stress_type, 0.005)
+        temp_factor = _arrhenius_factor(temperature)
+        k, t_half, k_factor, mw_factor = _kinetics_kernel(scores, mws, k_base, temp_factor)
+        
+        return [
+            {
+                'rate_constant_k': float(k[i]),
+                'half_life_hours': float(t_half[i]),
+                'half_life_days': float(t_half[i] / 24),
+                'factors': {
+                    'base_k': k_base,
+                    'susceptibility_factor': float(k_factor[i]),
+                    'mw_factor': float(mw_factor[i]),
+                    'temperature_factor': temp_factor
+                }
+            }
+            for i in range(len(smiles_list))
+        ]
 
 def main():
     """Demo usage"""
@@ -323,7 +534,7 @@ def main():
     
     # Identify reactive sites
     print("\n2. Reactive Sites:")
-    sites = extractor.identify_reactive_sites(aspirin_smiles)
+    sites = extractor.identify_reactive_sites(aspirin_smiles).to_dict()
     for site, data in sites.items():
         if data['count'] > 0:
             print(f"  {site}: {data['count']} site(s)")
@@ -4,30 +4,54 @@ Microservice for molecular predictions
 """
 
 import sys
-import json
+import orjson
 from degradationPredictor import DegradationProductPredictor
 from molecularFeatures import MolecularFeatureExtractor
 
+def _dumps(obj):
+    """Compact JSON text; NumPy scalars and arrays are serialized natively"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
 def prediction_service(request_json):
     """
     Service endpoint for degradation predictions
     
     Request format:
     {
-        "action": "predict_products" | "predict_mb" | "analyze_structure",
+        "action": "predict_products" | "predict_mb" | "analyze_structure" | "predict_batch",
         "smiles": "...",
+        "smiles_list": ["...", ...] (predict_batch only),
         "stress_type": "acid|base|oxidative|thermal|photolytic",
         "degradation_percent": float (optional)
     }
     """
     try:
-        request = json.loads(request_json)
+        request = orjson.loads(request_json)
         action = request.get('action', 'predict_products')
         smiles = request.get('smiles')
         stress_type = request.get('stress_type', 'oxidative')
         
+        if action == 'predict_batch':
+            smiles_list = request.get('smiles_list')
+            if not smiles_list:
+                return _dumps({
+                    'success': False,
+                    'error': 'smiles_list required'
+                })
+            
+            descriptors = MolecularFeatureExtractor().featurize_many(smiles_list)
+            
+            return _dumps({
+                'success': True,
+                'action': 'predict_batch',
+                'result': {
+                    'molecular_descriptors': descriptors,
+                    'num_molecules': len(descriptors)
+                }
+            })
+        
         if not smiles:
-            return json.dumps({
+            return _dumps({
                 'success': False,
                 'error': 'SMILES string required'
             })
@@ -38,50 +62,55 @@ def prediction_service(request_json):
         if action == 'predict_products':
             products = predictor.predict_products(smiles, stress_type, max_products=5)
             
-            return json.dumps({
+            return _dumps({
                 'success': True,
                 'action': 'predict_products',
                 'result': {
                     'products': products,
                     'num_products': len(products)
                 }
-            }, indent=2)
+            })
         
         elif action == 'predict_mb':
             degradation_percent = request.get('degradation_percent', 10)
             mb_prediction = predictor.predict_mass_balance(smiles, stress_type, degradation_percent)
             
-            return json.dumps({
+            return _dumps({
                 'success': True,
                 'action': 'predict_mb',
                 'result': mb_prediction
-            }, indent=2)
+            })
         
         elif action == 'analyze_structure':
+            # One parse and one site search: both calls share the cached
+            # _parse_smiles Mol, and the scoring and kinetics steps reuse
+            # these intermediates instead of recomputing them
             descriptors = extractor.calculate_descriptors(smiles)
-            susceptibility = extractor.predict_degradation_susceptibility(smiles, stress_type)
-            kinetics = extractor.estimate_degradation_rate(smiles, stress_type, temperature=25)
             reactive_sites = extractor.identify_reactive_sites(smiles)
+            susceptibility = extractor.score_susceptibility(descriptors, reactive_sites, stress_type)
+            kinetics = extractor.rate_from_score(
+                descriptors, susceptibility['susceptibility_score'], stress_type, temperature=25
+            )
             
-            return json.dumps({
+            return _dumps({
                 'success': True,
                 'action': 'analyze_structure',
                 'result': {
                     'molecular_descriptors': descriptors,
                     'degradation_susceptibility': susceptibility,
                     'kinetics': kinetics,
-                    'reactive_sites': reactive_sites
+                    'reactive_sites': susceptibility['reactive_sites']
                 }
-            }, indent=2)
+            })
         
         else:
-            return json.dumps({
+            return _dumps({
                 'success': False,
                 'error': f'Unknown action: {action}'
             })
     
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             'success': False,
             'error': str(e),
             'type': type(e).__name__
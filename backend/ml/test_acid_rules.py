@@ -1,18 +1,16 @@
 from rdkit import Chem
 from rdkit.Chem import AllChem
 
-def test_reaction(name, smarts, smiles):
+def test_reaction(name, rxn, reactant):
     print(f"\n--- Testing {name} ---")
-    print(f"SMARTS: {smarts}")
-    print(f"Reactant SMILES: {smiles}")
+    print(f"SMARTS: {AllChem.ReactionToSmarts(rxn)}")
     
     try:
-        rxn = AllChem.ReactionFromSmarts(smarts)
-        reactant = Chem.MolFromSmiles(smiles)
-        
         if reactant is None:
             print("Invalid reactant SMILES")
             return
+        
+        print(f"Reactant SMILES: {Chem.MolToSmiles(reactant)}")
 
         products = rxn.RunReactants((reactant,))
         
@@ -32,23 +30,25 @@ def test_reaction(name, smarts, smiles):
 
 # 1. Ester Hydrolysis
 # Aspirin: CC(=O)Oc1ccccc1C(=O)O
-aspirin = "CC(=O)Oc1ccccc1C(=O)O" 
+aspirin = Chem.MolFromSmiles("CC(=O)Oc1ccccc1C(=O)O")
 # Pattern: Break C(=O)-O bond. Allow aromatic carbons [C,c] or [#6]
 # [C,c:1](=[O:2])[O:3][C,c:4]>>[C,c:1](=[O:2])[OH].[C,c:4][O:3][H]
 ester_smarts_mapped = '[C,c:1](=[O:2])[O:3][C,c:4]>>[C,c:1](=[O:2])[OH].[C,c:4][O:3][H]'
+_RXN_ESTER = AllChem.ReactionFromSmarts(ester_smarts_mapped)
 
-test_reaction("Ester Hydrolysis (Correct Mapped)", ester_smarts_mapped, aspirin)
+test_reaction("Ester Hydrolysis (Correct Mapped)", _RXN_ESTER, aspirin)
 
 # 2. Amide Hydrolysis
 # Paracetamol: CC(=O)Nc1ccc(O)cc1
-paracetamol = "CC(=O)Nc1ccc(O)cc1"
+paracetamol = Chem.MolFromSmiles("CC(=O)Nc1ccc(O)cc1")
 # [C,c:1](=[O:2])[N:3][C,c:4]
 amide_smarts_mapped = '[C,c:1](=[O:2])[N:3][C,c:4]>>[C,c:1](=[O:2])[OH].[C,c:4][N:3][H]'
+_RXN_AMIDE = AllChem.ReactionFromSmarts(amide_smarts_mapped)
 
-test_reaction("Amide Hydrolysis (Correct Mapped)", amide_smarts_mapped, paracetamol)
+test_reaction("Amide Hydrolysis (Correct Mapped)", _RXN_AMIDE, paracetamol)
 
 # 3. Lactone Opening
 # delta-Valerolactone: O=C1CCCCO1
-lactone = "O=C1CCCCO1"
+lactone = Chem.MolFromSmiles("O=C1CCCCO1")
 # Same ester pattern should work for lactone if RDKit handles ring opening correctly with same mapping
-test_reaction("Lactone Opening (Using Ester Rule)", ester_smarts_mapped, lactone)
+test_reaction("Lactone Opening (Using Ester Rule)", _RXN_ESTER, lactone)
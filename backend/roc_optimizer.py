@@ -29,13 +29,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import confusion_matrix, roc_auc_score, roc_curve
+from sklearn.metrics import roc_auc_score, roc_curve
 from sklearn.model_selection import StratifiedKFold, cross_val_predict
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
@@ -126,43 +122,51 @@ def load_training_data(config: ROCConfig):
     feature_cols = payload.get('feature_columns', ['degradation_level', 'lk_imb', 'cimb'])
     label_col    = payload.get('label_column', 'actual_failure')
 
-    # Validate every record has required keys
-    missing = [
-        r.get('sample_id', f'row_{i}')
-        for i, r in enumerate(records)
-        if any(col not in r for col in feature_cols + [label_col])
-    ]
+    # Single pass: fill preallocated arrays, validating required keys as we go
+    X = np.empty((len(records), len(feature_cols)), dtype=np.float64)
+    y = np.empty(len(records), dtype=np.int32)
+    missing = []
+    for i, r in enumerate(records):
+        try:
+            X[i] = [r[col] for col in feature_cols]
+            y[i] = bool(r[label_col])
+        except KeyError:
+            missing.append(r.get('sample_id', f'row_{i}'))
     if missing:
         raise ValueError(f"Records missing required columns: {missing}")
 
-    X = np.array([[r[col] for col in feature_cols] for r in records], dtype=np.float64)
-    y = np.array([int(bool(r[label_col])) for r in records], dtype=np.int32)
-
     return X, y, feature_cols, len(records)
 
 
 # ─── Numerics utilities ────────────────────────────────────────────────────────
-def _safe_div(numerator: float, denominator: float, fallback: float = 0.0) -> float:
-    """Floating-point safe division with explicit fallback."""
-    if denominator == 0.0:
-        return fallback
-    return float(numerator) / float(denominator)
+def roc_operating_point(fpr: float, tpr: float, n_pos: int, n_neg: int) -> dict:
+    """
+    Confusion counts and classification metrics at one ROC operating point.
 
+    roc_curve's fpr/tpr at threshold i are exactly the rates of the rule
+    y_score >= thresholds[i], so the counts follow without re-predicting:
+    TP = TPR·P, FP = FPR·N.  Undefined ratios (0/0) are reported as 0.0.
 
-def safe_confusion_matrix(y_true: np.ndarray, y_pred: np.ndarray
-                           ) -> Tuple[int, int, int, int]:
+    Returns
+    -------
+    dict: tp, fp, tn, fn (int), sensitivity, specificity, ppv, npv, accuracy
     """
-    Compute (TN, FP, FN, TP) safely for any prediction distribution.
+    tp = int(round(tpr * n_pos))
+    fp = int(round(fpr * n_neg))
+    fn = n_pos - tp
+    tn = n_neg - fp
 
-    Handles degenerate cases where all predictions are one class,
-    which would cause confusion_matrix().ravel() to raise ValueError
-    (1×1 output instead of 2×2).
-    """
-    # Extract unique classes present in the true labels
-    classes = np.unique(y_true)
-    cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
-    tn, fp, fn, tp = cm.ravel().tolist()
-    return int(tn), int(fp), int(fn), int(tp)
+    def ratio(num, den):
+        return num / den if den > 0 else 0.0
+
+    return {
+        'tp': tp, 'fp': fp, 'tn': tn, 'fn': fn,
+        'sensitivity': ratio(tp, tp + fn),
+        'specificity': ratio(tn, tn + fp),
+        'ppv':         ratio(tp, tp + fp),
+        'npv':         ratio(tn, tn + fn),
+        'accuracy':    (tp + tn) / (n_pos + n_neg),
+    }
 
 
 # ─── AUC confidence interval  (DeLong 1988) ──────────────────────────────────
@@ -270,7 +274,7 @@ def _probit(p: float) -> float:
 # ─── Threshold selection ───────────────────────────────────────────────────────
 def select_optimal_threshold(fpr: np.ndarray, tpr: np.ndarray,
                               thresholds: np.ndarray,
-                              config: ROCConfig) -> Tuple[float, float, float]:
+                              config: ROCConfig) -> Tuple[float, float, float, int]:
     """
     Select the optimal probability threshold from a ROC curve.
 
@@ -290,7 +294,8 @@ def select_optimal_threshold(fpr: np.ndarray, tpr: np.ndarray,
 
     Returns
     -------
-    (optimal_proba_threshold, optimal_ci_threshold, score_at_optimum)
+    (optimal_proba_threshold, optimal_ci_threshold, score_at_optimum, optimal_idx)
+    optimal_idx indexes fpr/tpr/thresholds at the selected operating point.
     """
     method = config.threshold_method.lower()
 
@@ -318,7 +323,7 @@ def select_optimal_threshold(fpr: np.ndarray, tpr: np.ndarray,
     optimal_proba = float(thresholds[optimal_idx])
     optimal_ci    = round((1.0 - optimal_proba) * 100.0, 4)
 
-    return optimal_proba, optimal_ci, max_score
+    return optimal_proba, optimal_ci, max_score, optimal_idx
 
 
 # ─── Bootstrap CI for threshold ────────────────────────────────────────────────
@@ -370,7 +375,7 @@ def bootstrap_threshold_ci(X: np.ndarray, y: np.ndarray,
                 continue
 
             fp_b, tp_b, thr_b = roc_curve(y_oob, y_score_oob)
-            _, ci_thr, _ = select_optimal_threshold(fp_b, tp_b, thr_b, config)
+            _, ci_thr, _, _ = select_optimal_threshold(fp_b, tp_b, thr_b, config)
             ci_thresholds.append(ci_thr)
         except Exception:
             continue   # robustly skip degenerate bootstrap draws
@@ -470,7 +475,7 @@ def train_and_evaluate(X: np.ndarray, y: np.ndarray,
 
     # ── ROC curve + threshold selection ──────────────────────────────────────
     fpr, tpr, thresholds = roc_curve(y, y_score)
-    optimal_proba, optimal_ci, j_at_optimum = select_optimal_threshold(
+    optimal_proba, optimal_ci, j_at_optimum, optimal_idx = select_optimal_threshold(
         fpr, tpr, thresholds, config
     )
     log.info(
@@ -507,15 +512,17 @@ def train_and_evaluate(X: np.ndarray, y: np.ndarray,
     # ── Confusion matrix at operational threshold ──────────────────────────────
     # Use the original probability threshold from Youden's J for the CM
     # (we cannot reverse-map the regulatory CI floor to a probability exactly).
-    y_pred = (y_score >= optimal_proba).astype(np.int32)
-    tn, fp, fn, tp = safe_confusion_matrix(y, y_pred)
-
-    total = tp + tn + fp + fn
-    sensitivity = _safe_div(tp, tp + fn)
-    specificity = _safe_div(tn, tn + fp)
-    ppv         = _safe_div(tp, tp + fp)
-    npv         = _safe_div(tn, tn + fn)
-    accuracy    = _safe_div(tp + tn, total)
+    # The counts come straight from the ROC rates at the selected index.
+    n_pos = int(np.sum(y == 1))
+    point = roc_operating_point(float(fpr[optimal_idx]), float(tpr[optimal_idx]),
+                                n_pos, len(y) - n_pos)
+
+    tp, fp, tn, fn = (point[k] for k in ('tp', 'fp', 'tn', 'fn'))
+    sensitivity = point['sensitivity']
+    specificity = point['specificity']
+    ppv         = point['ppv']
+    npv         = point['npv']
+    accuracy    = point['accuracy']
 
     # ── Extract coefficients for JS runtime inference ─────────────────────────
     coef_list    = classifier.coef_[0].tolist()
@@ -575,6 +582,13 @@ def train_and_evaluate(X: np.ndarray, y: np.ndarray,
 # ─── Visualisation ─────────────────────────────────────────────────────────────
 def plot_roc_curve(results: dict, config: ROCConfig) -> str:
     """Generate 4-panel ROC analysis figure."""
+    # Plotting stack is imported on demand; importers of the numerics
+    # functions never pay for it.  Agg: file output only, no GUI backend.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     fig, axes = plt.subplots(2, 2, figsize=(13, 11))
     fig.suptitle(
         f'ROC Analysis — LogisticRegression  ({config.n_cv_splits}-Fold CV)\n'
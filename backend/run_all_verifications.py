@@ -0,0 +1,68 @@
+"""
+Runs every verify_*.py suite in one process: one interpreter start, one
+connection pool, and all suites' requests in flight together
+"""
+
+import asyncio
+import httpx
+import sys
+import orjson
+from verify_common import make_client, print_result, post_calculate_batch, require_backend, use_cassette
+from verify_bayesian import BAYES_PAYLOAD, check_bayesian_result
+from verify_endpoints import test_endpoints
+from verify_lims import test_lims
+from verify_ml_prediction import ANOMALY_PAYLOAD, check_ml_prediction
+
+async def test_calculate_batch(client):
+    # Both /calculate probes in one request: the server runs a single
+    # vectorized Bayesian update for the pair
+    response = await post_calculate_batch(client, [BAYES_PAYLOAD, ANOMALY_PAYLOAD])
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError:
+        print_result("Calculate Batch Request", False, f"Status: {response.status_code}, {response.text}")
+        return False
+    
+    bayesian, anomaly = orjson.loads(response.content)
+    bayesian_ok = check_bayesian_result(bayesian)
+    anomaly_ok = check_ml_prediction(anomaly)
+    return bayesian_ok and anomaly_ok
+
+async def test_endpoints_suite(client):
+    passed, total = await test_endpoints(client)
+    print(f"Endpoints: {passed}/{total} passed")
+    return passed == total
+
+async def main():
+    print("--- Starting Full Verification ---\n")
+    
+    # vcr patches the transport process-wide, so the concurrent suites share
+    # one cassette rather than each opening its own
+    async with make_client() as client:
+        await require_backend(client)
+        with use_cassette("all.yaml"):
+            results = await asyncio.gather(
+                test_calculate_batch(client),
+                test_endpoints_suite(client),
+                test_lims(client),
+                return_exceptions=True
+            )
+    
+    print("\n--- Summary ---")
+    failed = 0
+    for name, result in zip(("Calculate Batch", "Endpoints", "LIMS"), results):
+        if isinstance(result, Exception):
+            print(f"✗ {name}: {result!r}")
+            failed += 1
+        elif result:
+            print(f"✓ {name}")
+        else:
+            print(f"✗ {name}")
+            failed += 1
+    
+    print(f"\n--- Verification Complete: {len(results) - failed}/{len(results)} suites passed ---")
+    return failed == 0
+
+if __name__ == "__main__":
+    # Non-zero exit when any suite fails or raises, so the runner can gate CI
+    sys.exit(0 if asyncio.run(main()) else 1)
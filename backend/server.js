@@ -53,51 +53,72 @@ const {
 const limsManager = require('./lims/limsManager');
 
 // ML Anomaly Detection Helper
-function detectAnomaly(data) {
-    return new Promise((resolve, reject) => {
-        console.log('🔮 Running ML Anomaly Detection...');
-        const pythonProcess = spawn('python', [path.join(__dirname, 'ml/mlService.py')]);
+// mlService.py runs as a long-lived worker so the models are unpickled once;
+// requests and responses are newline-delimited JSON, answered in order.
+let mlWorker = null;
+
+function getMLWorker() {
+    if (mlWorker) return mlWorker;
+
+    const worker = spawn('python', [path.join(__dirname, 'ml/mlService.py')]);
+    worker.pending = [];
+    let buffer = '';
+
+    worker.stdout.on('data', (chunk) => {
+        buffer += chunk.toString();
+        let newline;
+        while ((newline = buffer.indexOf('\n')) !== -1) {
+            const line = buffer.slice(0, newline).trim();
+            buffer = buffer.slice(newline + 1);
+            if (!line) continue;
+
+            const resolve = worker.pending.shift();
+            if (!resolve) continue;
+            try {
+                const result = JSON.parse(line);
+                if (result.error) {
+                    console.error("ML Error from script:", result.error);
+                    resolve(null);
+                } else {
+                    resolve(result);
+                }
+            } catch (e) {
+                console.error('Failed to parse ML output:', e);
+                console.error('Raw output:', line);
+                resolve(null);
+            }
+        }
+    });
 
-        let output = '';
-        let error = '';
+    worker.stderr.on('data', (chunk) => {
+        console.warn(`ML Service Warning: ${chunk.toString()}`);
+    });
 
-        // Send data to stdin
-        pythonProcess.stdin.write(JSON.stringify(data));
-        pythonProcess.stdin.end();
+    worker.stdin.on('error', (err) => {
+        console.warn('ML Service stdin error:', err.message);
+    });
 
-        pythonProcess.stdout.on('data', (chunk) => {
-            output += chunk.toString();
-        });
+    worker.on('error', (err) => {
+        console.warn('ML Service failed to start:', err.message);
+    });
 
-        pythonProcess.stderr.on('data', (chunk) => {
-            error += chunk.toString();
-        });
+    worker.on('close', (code) => {
+        console.warn(`ML Service exited (code ${code})`);
+        if (mlWorker === worker) mlWorker = null;
+        // Requests still queued on this worker will never be answered
+        while (worker.pending.length) worker.pending.shift()(null);
+    });
 
-        pythonProcess.on('close', (code) => {
-            if (code !== 0) {
-                console.warn(`ML Service Warning (code ${code}): ${error}`);
-                resolve(null);
-            } else {
-                try {
-                    if (!output || output.trim() === '') {
-                        console.error('ML Service returned empty output');
-                        resolve(null);
-                        return;
-                    }
-                    const result = JSON.parse(output);
-                    if (result.error) {
-                        console.error("ML Error from script:", result.error);
-                        resolve(null);
-                    } else {
-                        resolve(result);
-                    }
-                } catch (e) {
-                    console.error('Failed to parse ML output:', e);
-                    console.error('Raw output:', output);
-                    resolve(null);
-                }
-            }
-        });
+    mlWorker = worker;
+    return worker;
+}
+
+function detectAnomaly(data) {
+    return new Promise((resolve) => {
+        console.log('🔮 Running ML Anomaly Detection...');
+        const worker = getMLWorker();
+        worker.pending.push(resolve);
+        worker.stdin.write(JSON.stringify(data) + '\n');
     });
 }
 
@@ -764,6 +785,82 @@ app.get('/', (req, res) => {
     });
 });
 
+// Liveness probe for scripts: no body work, so callers can fail fast when
+// the backend is down before sending expensive /calculate requests
+app.get('/api/healthz', (req, res) => {
+    res.json({ ok: true });
+});
+
+// Methods that get a Bayesian posterior, keyed by their results field
+const BAYESIAN_METHODS = [
+    { name: 'LK-IMB', value: 'lk_imb', std: 'lk_combined_std' },
+    { name: 'CIMB', value: 'cimb', std: 'cimb_combined_std' }
+];
+
+// Adds `<method>_bayesian` results to each calculation. Priors are read once
+// per method. A single calculation (/api/calculate) uses the scalar
+// bayesianUpdater.py path, one run per method, which loads neither numpy nor
+// scipy; batches update every (calculation, method) pair in one vectorized run.
+async function addBayesianResults(calculations) {
+    const targets = [];
+    const priorMean = [], priorStd = [], dataMean = [], dataStd = [];
+
+    for (const m of BAYESIAN_METHODS) {
+        let prior;
+        try {
+            prior = await getPriors(m.name);
+        } catch (e) {
+            console.error(`Failed to load priors for ${m.name}:`, e);
+            continue;
+        }
+        if (!prior) continue;
+
+        for (const calculation of calculations) {
+            const value = calculation.results[m.value];
+            if (value === null) continue;
+            targets.push({ calculation, key: `${m.name.toLowerCase().replace('-', '_')}_bayesian` });
+            priorMean.push(prior.prior_mean);
+            priorStd.push(prior.prior_std);
+            dataMean.push(value);
+            dataStd.push(calculation.results[m.std] || 2.5); // Default to 2.5% if std not available
+        }
+    }
+
+    if (!targets.length) return;
+
+    if (calculations.length === 1) {
+        await Promise.all(targets.map(async ({ calculation, key }, i) => {
+            const result = await runBayesianAnalysis(
+                { prior_mean: priorMean[i], prior_std: priorStd[i] },
+                { mean: dataMean[i], std: dataStd[i], n: 3 }
+            );
+            if (result && !result.error) {
+                calculation.results[key] = result;
+            }
+        }));
+        return;
+    }
+
+    const batch = await runBayesianAnalysis(
+        { prior_mean: priorMean, prior_std: priorStd },
+        { mean: dataMean, std: dataStd, n: 3 }
+    );
+    if (!batch || batch.error) {
+        console.error('Failed to run Bayesian analysis:', batch && batch.error);
+        return;
+    }
+
+    targets.forEach(({ calculation, key }, i) => {
+        calculation.results[key] = {
+            posterior_mean: batch.posterior_mean[i],
+            posterior_std: batch.posterior_std[i],
+            credible_interval_95: batch.credible_interval_95[i],
+            prior_weight: batch.prior_weight[i],
+            data_weight: batch.data_weight[i]
+        };
+    });
+}
+
 // POST /api/calculate
 app.post('/api/calculate', async (req, res) => {
     try {
@@ -775,29 +872,7 @@ app.post('/api/calculate', async (req, res) => {
         const calculation = await calculateMassBalance(req.body, hybrid_results);
 
         // Run Bayesian Analysis for supported methods
-        const methodsToCheck = [
-            { name: 'LK-IMB', value: calculation.results.lk_imb, std: calculation.results.lk_combined_std },
-            { name: 'CIMB', value: calculation.results.cimb, std: calculation.results.cimb_combined_std }
-        ];
-
-        for (const m of methodsToCheck) {
-            try {
-                const prior = await getPriors(m.name);
-                if (prior && m.value !== null) {
-                    const bayesianResult = await runBayesianAnalysis(prior, {
-                        mean: m.value,
-                        std: m.std || 2.5, // Default to 2.5% if std not available
-                        n: 3
-                    });
-
-                    if (bayesianResult) {
-                        calculation.results[`${m.name.toLowerCase().replace('-', '_')}_bayesian`] = bayesianResult;
-                    }
-                }
-            } catch (e) {
-                console.error(`Failed to run Bayesian analysis for ${m.name}:`, e);
-            }
-        }
+        await addBayesianResults([calculation]);
 
         console.log('✓ Calculation complete:', calculation.recommended_method, calculation.recommended_value + '%');
         console.log('  CIMB:', calculation.results.cimb + '%', 'Risk:', calculation.results.cimb_risk_level);
@@ -808,6 +883,32 @@ app.post('/api/calculate', async (req, res) => {
     }
 });
 
+// POST /api/calculate/batch
+// Body: { samples: [<calculate payload>, ...] }
+// Returns one entry per sample, in order: the /api/calculate result, or
+// { error } for a sample that failed validation
+app.post('/api/calculate/batch', async (req, res) => {
+    const samples = req.body && req.body.samples;
+    if (!Array.isArray(samples) || samples.length === 0) {
+        return res.status(400).json({ error: 'samples must be a non-empty array' });
+    }
+
+    try {
+        console.log(`📊 Calculating mass balance for ${samples.length} samples...`);
+        const results = await Promise.all(samples.map(
+            (sample) => calculateMassBalance(sample, null).catch((error) => ({ error: error.message }))
+        ));
+
+        await addBayesianResults(results.filter((r) => !r.error));
+
+        console.log(`✓ Batch calculation complete (${samples.length} samples)`);
+        res.json(results);
+    } catch (error) {
+        console.error('❌ Batch calculation error:', error);
+        res.status(500).json({ error: error.message });
+    }
+});
+
 // POST /api/save
 app.post('/api/save', (req, res) => {
     const { inputs, results } = req.body;
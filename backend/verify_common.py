@@ -0,0 +1,86 @@
+"""
+Shared setup for the verify_*.py scripts: API base URL, HTTP client
+configuration, recorded fixtures and result printing
+"""
+
+import contextlib
+import os
+import sys
+import httpx
+
+# Point at an HTTPS reverse proxy (e.g. nginx `listen 443 ssl http2;`) in
+# front of the API to run the probes over HTTP/2
+BASE_URL = os.environ.get('VERIFY_BASE_URL', "http://localhost:5000/api")
+
+# Opt-in HTTP/2 (needs `pip install httpx[http2]`): the concurrent probes then
+# multiplex on one connection. httpx only negotiates h2 over TLS, so against
+# the plain-HTTP Express server this stays HTTP/1.1.
+HTTP2 = os.environ.get('VERIFY_HTTP2') == '1'
+
+# Keep-alive pool shared by all calls on the client: connections are reused
+# instead of re-handshaking per request
+LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=4)
+
+# Fail fast on connect, but leave room for the calculate and Excel endpoints,
+# which spawn Python on the server
+TIMEOUT = httpx.Timeout(30.0, connect=3.05)
+
+# Request bodies are encoded once at import with orjson and posted as raw
+# bytes, so no call pays for the stdlib json encoder
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Recorded HTTP fixtures, opt-in (needs vcrpy). Unset, the scripts talk to the
+# server directly. VCR_RECORD_MODE=all (or new_episodes) records against a live
+# backend with the full ML stack into CASSETTE_DIR; VCR_RECORD_MODE=none, for
+# CI, replays those cassettes offline and fails on any unrecorded request.
+# No cassettes are committed yet: they have to be recorded against a running
+# server with trained models, then committed from tests/fixtures/vcr/.
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'fixtures', 'vcr')
+VCR_RECORD_MODE = os.environ.get('VCR_RECORD_MODE')
+REPLAYING = VCR_RECORD_MODE == 'none'
+
+def use_cassette(name):
+    """Context manager recording/replaying `name` when VCR_RECORD_MODE is set"""
+    if not VCR_RECORD_MODE:
+        return contextlib.nullcontext()
+    import vcr
+    return vcr.VCR(
+        cassette_library_dir=CASSETTE_DIR,
+        record_mode=VCR_RECORD_MODE,
+        match_on=['method', 'scheme', 'host', 'port', 'path', 'body'],
+    ).use_cassette(name)
+
+def make_client():
+    """Async client used by every verify script; use with `async with`"""
+    return httpx.AsyncClient(timeout=TIMEOUT, limits=LIMITS, http2=HTTP2)
+
+async def require_backend(client):
+    """Exits the script at once if the API is not answering /healthz"""
+    # Called outside the cassette so a recorded 200 can't mask a down server;
+    # replay runs need no server at all
+    if REPLAYING:
+        return
+    try:
+        response = await client.get(f"{BASE_URL}/healthz", timeout=1.0)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"✗ Backend not reachable: {e}")
+        sys.exit(1)
+
+def print_result(test_name, success, details=None):
+    symbol = "✓" if success else "✗"
+    print(f"{symbol} {test_name}")
+    if details:
+        print(f"  Details: {details}")
+
+async def post_json(client, url, body):
+    """POST a body already encoded with orjson.dumps"""
+    return await client.post(url, content=body, headers=JSON_HEADERS)
+
+async def post_calculate(client, body):
+    return await post_json(client, f"{BASE_URL}/calculate", body)
+
+async def post_calculate_batch(client, bodies):
+    """One /calculate/batch round trip; the response is a list in body order"""
+    # Splice the pre-encoded samples in rather than decoding and re-encoding them
+    return await post_json(client, f"{BASE_URL}/calculate/batch", b'{"samples":[' + b','.join(bodies) + b']}')
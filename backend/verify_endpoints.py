@@ -1,62 +1,95 @@
-import requests
+import asyncio
+import httpx
 import json
+import orjson
 import sys
+from typing import Final
+from verify_common import BASE_URL, JSON_HEADERS, make_client, post_json, require_backend, use_cassette
 
-BASE_URL = "http://localhost:5000/api"
+# 3. Calculation with Hybrid Detection
+HYBRID_PAYLOAD = {
+    "initial_api": 99.5,
+    "stressed_api": 85.0,
+    "initial_degradants": 0.2,
+    "stressed_degradants": 12.3,
+    "degradant_mw": 200,
+    "parent_mw": 400,
+    "stress_type": "Acid",
+    "detection_method": "UV+ELSD",
+    "uv_rrf": 1.0,
+    "elsd_rrf": 1.5,
+    "ms_intensity": 500000,
+    "gc_ms_detected": False
+}
+HYBRID_BODY: Final[bytes] = orjson.dumps(HYBRID_PAYLOAD)
 
-def test_endpoint(name, url, method="GET", data=None):
+# 4. Excel Generation (should return binary)
+EXCEL_BODY: Final[bytes] = orjson.dumps({**HYBRID_PAYLOAD, "sample_id": "TEST-001"})
+
+async def test_endpoint(client, name, url, method="GET", data=None):
     try:
         if method == "GET":
-            response = requests.get(url)
+            response = await client.get(url)
         else:
-            response = requests.post(url, json=data)
+            response = await post_json(client, url, data)
         
         response.raise_for_status()
         print(f"✅ {name}: SUCCESS ({response.status_code})")
         return True
     except Exception as e:
         print(f"❌ {name}: FAILED - {str(e)}")
-        if hasattr(e, 'response') and e.response:
+        if isinstance(e, httpx.HTTPStatusError):
             print(f"   Response: {e.response.text}")
         return False
 
-print("running verification tests...")
-
-# 1. Test Regulatory Matrix
-test_endpoint("Regulatory Matrix", f"{BASE_URL}/regulatory/matrix")
-
-# 2. Test ROC Config
-test_endpoint("ROC Config", f"{BASE_URL}/roc/config")
+async def test_excel(client, body):
+    # Excel generation might fail if file handles interfere, but let's try
+    # Just check status code; the workbook is streamed and only its size
+    # kept. That holds for live runs only: under a cassette (VCR_RECORD_MODE
+    # set) vcrpy reads the whole response into memory to record or replay it.
+    try:
+        async with client.stream("POST", f"{BASE_URL}/excel/generate", content=body, headers=JSON_HEADERS) as resp:
+            if resp.status_code != 200:
+                print(f"❌ Excel Generation: FAILED (Status {resp.status_code})")
+                return False
+            n = 0
+            async for chunk in resp.aiter_bytes(65536):
+                n += len(chunk)
+        if n > 0:
+            print(f"✅ Excel Generation: SUCCESS ({n} bytes)")
+            return True
+        print("❌ Excel Generation: FAILED (empty response)")
+        return False
+    except Exception as e:
+        print(f"❌ Excel Generation: FAILED - {str(e)}")
+        return False
 
-# 3. Test Calculation with Hybrid Detection
-hybrid_payload = {
-    "initial_api": 99.5,
-    "stressed_api": 85.0,
-    "initial_degradants": 0.2,
-    "stressed_degradants": 12.3,
-    "degradant_mw": 200,
-    "parent_mw": 400,
-    "stress_type": "Acid",
-    "detection_method": "UV+ELSD",
-    "uv_rrf": 1.0,
-    "elsd_rrf": 1.5,
-    "ms_intensity": 500000,
-    "gc_ms_detected": False
-}
-test_endpoint("Hybrid Calculation", f"{BASE_URL}/calculate", "POST", hybrid_payload)
+async def test_endpoints(client):
+    """Runs all endpoint probes; returns (passed, total)"""
+    # The probes are independent: run them concurrently and report each one
+    # as soon as it finishes, so a slow Excel build doesn't hold up the rest
+    probes = [
+        # 1. Regulatory Matrix
+        test_endpoint(client, "Regulatory Matrix", f"{BASE_URL}/regulatory/matrix"),
+        # 2. ROC Config
+        test_endpoint(client, "ROC Config", f"{BASE_URL}/roc/config"),
+        test_endpoint(client, "Hybrid Calculation", f"{BASE_URL}/calculate", "POST", HYBRID_BODY),
+        test_excel(client, EXCEL_BODY),
+    ]
+    passed = 0
+    for probe in asyncio.as_completed(probes):
+        passed += await probe
+    return passed, len(probes)
 
-# 4. Test Excel Generation (should return binary)
-excel_payload = hybrid_payload.copy()
-excel_payload["sample_id"] = "TEST-001"
-# Excel generation might fail if file handles interfere, but let's try
-# Just check status code
-try:
-    resp = requests.post(f"{BASE_URL}/excel/generate", json=excel_payload)
-    if resp.status_code == 200 and len(resp.content) > 0:
-        print(f"✅ Excel Generation: SUCCESS ({len(resp.content)} bytes)")
-    else:
-        print(f"❌ Excel Generation: FAILED (Status {resp.status_code})")
-except Exception as e:
-    print(f"❌ Excel Generation: FAILED - {str(e)}")
+async def main():
+    print("running verification tests...")
+    
+    async with make_client() as client:
+        await require_backend(client)
+        with use_cassette("endpoints.yaml"):
+            passed, total = await test_endpoints(client)
+    
+    print(f"\nVerification Complete. {passed}/{total} passed.")
 
-print("\nVerification Complete.")
+if __name__ == "__main__":
+    asyncio.run(main())
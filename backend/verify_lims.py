@@ -1,32 +1,36 @@
 
-import requests
+import asyncio
+import httpx
 import json
+import orjson
 import time
+from verify_common import BASE_URL, make_client, print_result, require_backend, use_cassette
 
-BASE_URL = "http://localhost:5000/api"
+# /lims/systems is static for a run, so it is fetched once per process.
+# A module global rather than lru_cache: a cached coroutine can only be awaited once.
+_systems = None
 
-def print_result(test_name, success, details=None):
-    symbol = "✓" if success else "✗"
-    print(f"{symbol} {test_name}")
-    if details:
-        print(f"  Details: {details}")
+async def _cached_systems(client):
+    global _systems
+    if _systems is None:
+        response = await client.get(f"{BASE_URL}/lims/systems")
+        response.raise_for_status()
+        _systems = orjson.loads(response.content).get("systems", [])
+    return _systems
 
-def test_list_systems():
+async def test_list_systems(client):
     try:
-        response = requests.get(f"{BASE_URL}/lims/systems")
-        if response.status_code == 200:
-            data = response.json()
-            systems = data.get("systems", [])
-            print_result("List LIMS Systems", True, f"Found {len(systems)} systems: {', '.join([s['name'] for s in systems])}")
-            return systems
-        else:
-            print_result("List LIMS Systems", False, f"Status: {response.status_code}, {response.text}")
-            return []
+        systems = await _cached_systems(client)
+        print_result("List LIMS Systems", True, f"Found {len(systems)} systems: {', '.join([s['name'] for s in systems])}")
+        return systems
+    except httpx.HTTPStatusError as e:
+        print_result("List LIMS Systems", False, f"Status: {e.response.status_code}, {e.response.text}")
+        return []
     except Exception as e:
         print_result("List LIMS Systems", False, str(e))
         return []
 
-def test_initialize(system_name):
+async def test_initialize(client, system_name):
     try:
         payload = {
             "system_name": system_name,
@@ -37,49 +41,58 @@ def test_initialize(system_name):
                 "password": "test_password"
             }
         }
-        response = requests.post(f"{BASE_URL}/lims/initialize", json=payload)
-        if response.status_code == 200:
-            data = response.json()
-            print_result(f"Initialize {system_name}", True, data.get("message"))
-            return True
-        else:
-            print_result(f"Initialize {system_name}", False, f"Status: {response.status_code}, {response.text}")
-            return False
+        response = await client.post(f"{BASE_URL}/lims/initialize", json=payload)
+        response.raise_for_status()
+        print_result(f"Initialize {system_name}", True, orjson.loads(response.content).get("message"))
+        return True
+    except httpx.HTTPStatusError as e:
+        print_result(f"Initialize {system_name}", False, f"Status: {e.response.status_code}, {e.response.text}")
+        return False
     except Exception as e:
         print_result(f"Initialize {system_name}", False, str(e))
         return False
 
-def test_status():
+async def test_status(client):
     try:
-        response = requests.get(f"{BASE_URL}/lims/status")
-        if response.status_code == 200:
-            data = response.json()
-            print_result("Get LIMS Status", True, json.dumps(data.get("status"), indent=2))
-        else:
-            print_result("Get LIMS Status", False, f"Status: {response.status_code}")
+        response = await client.get(f"{BASE_URL}/lims/status")
+        response.raise_for_status()
+        print_result("Get LIMS Status", True, json.dumps(orjson.loads(response.content).get("status"), indent=2))
+        return True
+    except httpx.HTTPStatusError as e:
+        print_result("Get LIMS Status", False, f"Status: {e.response.status_code}")
+        return False
     except Exception as e:
         print_result("Get LIMS Status", False, str(e))
+        return False
 
-def main():
-    print("--- Starting LIMS Verification ---\n")
-    
-    systems = test_list_systems()
+async def test_lims(client):
+    """Runs the LIMS checks; returns whether they all passed"""
+    systems = await test_list_systems(client)
     
     if not systems:
         print("No systems found to test.")
-        return
+        return False
 
-    # Pick the first supported system
-    target_system = next((s for s in systems if s.get('supported')), None)
+    # Initialize every supported system concurrently
+    target_systems = [s for s in systems if s.get('supported')]
     
-    if target_system:
-        system_id = target_system['id']
-        test_initialize(system_id)
-        test_status()
+    if target_systems:
+        initialized = await asyncio.gather(*(test_initialize(client, s['id']) for s in target_systems))
+        status_ok = await test_status(client)
+        return all(initialized) and status_ok
     else:
         print("No supported systems found.")
+        return False
+
+async def main():
+    print("--- Starting LIMS Verification ---\n")
+    
+    async with make_client() as client:
+        await require_backend(client)
+        with use_cassette("lims.yaml"):
+            await test_lims(client)
         
     print("\n--- Verification Complete ---")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,57 +1,62 @@
 
-import requests
+import asyncio
+import httpx
 import json
+import orjson
 import time
+from typing import Final
+from verify_common import make_client, print_result, post_calculate, require_backend, use_cassette
 
-BASE_URL = "http://localhost:5000/api"
+# Anomalous data: High degradation, very low mass balance
+ANOMALY_PAYLOAD: Final[bytes] = orjson.dumps({
+    "initial_api": 100.0,
+    "stressed_api": 70.0,
+    "initial_degradants": 0.0,
+    "stressed_degradants": 5.0, # Missing 25% of mass
+    "rrf": 1.0,
+    "parent_mw": 500,
+    "degradant_mw": 250,
+    "stress_type": "Thermal",
+    "sample_id": "TEST-ANOMALY-001"
+})
 
-def print_result(test_name, success, details=None):
-    symbol = "✓" if success else "✗"
-    print(f"{symbol} {test_name}")
-    if details:
-        print(f"  Details: {details}")
+def check_ml_prediction(data):
+    """Checks one /calculate response for the ML anomaly prediction; returns whether it passed"""
+    # Check for ml_prediction field
+    if "ml_prediction" in data and data["ml_prediction"]:
+        pred = data["ml_prediction"]
+        print_result("ML Prediction Field", True, f"Score: {pred['anomaly_score']:.2f}, Anomaly: {pred['is_anomaly']}")
 
-def test_ml_anomaly():
-    # Anomalous data: High degradation, very low mass balance
-    payload = {
-        "initial_api": 100.0,
-        "stressed_api": 70.0,
-        "initial_degradants": 0.0,
-        "stressed_degradants": 5.0, # Missing 25% of mass
-        "rrf": 1.0,
-        "parent_mw": 500,
-        "degradant_mw": 250,
-        "stress_type": "Thermal",
-        "sample_id": "TEST-ANOMALY-001"
-    }
-    
-    try:
-        response = requests.post(f"{BASE_URL}/calculate", json=payload)
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Check for ml_prediction field
-            if "ml_prediction" in data and data["ml_prediction"]:
-                pred = data["ml_prediction"]
-                print_result("ML Prediction Field", True, f"Score: {pred['anomaly_score']:.2f}, Anomaly: {pred['is_anomaly']}")
-                
-                if pred['is_anomaly']:
-                    print_result("Detects Anomaly", True, "Successfully returned is_anomaly=True")
-                else:
-                    print_result("Detects Anomaly", False, "Expected is_anomaly=True but got False")
-            else:
-                 print_result("ML Prediction Field", False, "Missing ml_prediction in response")
-                 print(json.dumps(data, indent=2))
-                 
+        if pred['is_anomaly']:
+            print_result("Detects Anomaly", True, "Successfully returned is_anomaly=True")
             return True
         else:
-            print_result("Calculate Request", False, f"Status: {response.status_code}, {response.text}")
+            print_result("Detects Anomaly", False, "Expected is_anomaly=True but got False")
             return False
+    else:
+         print_result("ML Prediction Field", False, "Missing ml_prediction in response")
+         print(json.dumps(data, indent=2))
+         return False
+
+async def test_ml_anomaly(client):
+    try:
+        response = await post_calculate(client, ANOMALY_PAYLOAD)
+        response.raise_for_status()
+        return check_ml_prediction(orjson.loads(response.content))
+    except httpx.HTTPStatusError as e:
+        print_result("Calculate Request", False, f"Status: {e.response.status_code}, {e.response.text}")
+        return False
     except Exception as e:
         print_result("Test Execution", False, str(e))
         return False
 
-if __name__ == "__main__":
+async def main():
     print("--- Starting ML Anomaly Verification ---\n")
-    test_ml_anomaly()
+    async with make_client() as client:
+        await require_backend(client)
+        with use_cassette("ml_prediction.yaml"):
+            await test_ml_anomaly(client)
     print("\n--- Verification Complete ---")
+
+if __name__ == "__main__":
+    asyncio.run(main())